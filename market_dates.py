@@ -0,0 +1,24 @@
+"""
+Date parsing shared by the analysis scripts.
+"""
+
+from datetime import datetime, timezone
+
+
+def parse_gamma_date(date_str):
+    """
+    Parse a Gamma API date ("2024-05-01", "2024-05-01T00:00:00Z", ...).
+
+    Returns a naive datetime in UTC, or None if the string doesn't parse.
+    Works on Python 3.10, whose fromisoformat doesn't accept a trailing 'Z'.
+    """
+    try:
+        if 'T' not in date_str:
+            return datetime.strptime(date_str, "%Y-%m-%d")
+        parsed = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None
+
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
@@ -5,6 +5,7 @@ Handles probability tracking, black swan detection, and large move detection.
 from datetime import datetime, timedelta
 from typing import Optional
 from dataclasses import dataclass
+from functools import cached_property
 from sqlalchemy import select, and_, func, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 from .database import async_session, init_db
@@ -64,6 +65,20 @@ class OverviewStats:
     data_age_hours: Optional[float] = None
     is_data_stale: bool = False
 
+    @cached_property
+    def bucket_stats_dict(self) -> list[dict]:
+        """Bucket stats as JSON-serializable dicts, built once per instance."""
+        return [
+            {
+                "bucket": b.bucket,
+                "total_resolved": b.total_resolved,
+                "correct_predictions": b.correct_predictions,
+                "accuracy_rate": b.accuracy_rate,
+                "black_swan_count": b.black_swan_count
+            }
+            for b in self.bucket_stats
+        ]
+
 
 class AnalyticsEngine:
     """
@@ -297,68 +312,71 @@ class AnalyticsEngine:
         detected_moves = []
 
         async with async_session() as session:
-            # Get active markets
-            result = await session.execute(
-                select(Market).where(Market.is_active == True)
+            # Let SQLite compute the swing per active market so only markets
+            # that crossed the threshold are loaded and checked in Python
+            swing = func.max(MarketSnapshot.probability) - func.min(MarketSnapshot.probability)
+            candidates_result = await session.execute(
+                select(Market, swing.label("change"))
+                .join(MarketSnapshot, MarketSnapshot.market_id == Market.id)
+                .where(and_(
+                    Market.is_active == True,
+                    MarketSnapshot.timestamp >= window_start
+                ))
+                .group_by(Market.id)
+                .having(and_(
+                    func.count(MarketSnapshot.id) >= 2,
+                    swing >= threshold
+                ))
             )
-            markets = result.scalars().all()
 
-            for market in markets:
-                # Get snapshots in the window
-                snapshots_result = await session.execute(
+            for market, change in candidates_result.all():
+                # Check if this move was already recorded
+                existing = await session.execute(
+                    select(LargeMove).where(and_(
+                        LargeMove.market_id == market.id,
+                        LargeMove.window_start >= window_start
+                    ))
+                )
+
+                if existing.scalar_one_or_none():
+                    continue
+
+                # Only the window endpoints are needed to record the move
+                window_snapshots = (
                     select(MarketSnapshot)
                     .where(and_(
                         MarketSnapshot.market_id == market.id,
                         MarketSnapshot.timestamp >= window_start
                     ))
-                    .order_by(MarketSnapshot.timestamp.asc())
+                    .limit(1)
                 )
-                snapshots = snapshots_result.scalars().all()
-
-                if len(snapshots) < 2:
-                    continue
-
-                # Find max change in window
-                min_prob = min(s.probability for s in snapshots)
-                max_prob = max(s.probability for s in snapshots)
-                change = abs(max_prob - min_prob)
-
-                if change >= threshold:
-                    # Check if this move was already recorded
-                    existing = await session.execute(
-                        select(LargeMove).where(and_(
-                            LargeMove.market_id == market.id,
-                            LargeMove.window_start >= window_start
-                        ))
-                    )
-
-                    if existing.scalar_one_or_none():
-                        continue
+                first_snapshot = (await session.execute(
+                    window_snapshots.order_by(MarketSnapshot.timestamp.asc())
+                )).scalar_one()
+                last_snapshot = (await session.execute(
+                    window_snapshots.order_by(MarketSnapshot.timestamp.desc())
+                )).scalar_one()
+
+                move = LargeMove(
+                    market_id=market.id,
+                    detected_at=datetime.utcnow(),
+                    window_start=first_snapshot.timestamp,
+                    window_end=last_snapshot.timestamp,
+                    probability_start=first_snapshot.probability,
+                    probability_end=last_snapshot.probability,
+                    change_points=change
+                )
+                session.add(move)
 
-                    # Record the move
-                    first_snapshot = snapshots[0]
-                    last_snapshot = snapshots[-1]
-
-                    move = LargeMove(
-                        market_id=market.id,
-                        detected_at=datetime.utcnow(),
-                        window_start=first_snapshot.timestamp,
-                        window_end=last_snapshot.timestamp,
-                        probability_start=first_snapshot.probability,
-                        probability_end=last_snapshot.probability,
-                        change_points=change
-                    )
-                    session.add(move)
-
-                    detected_moves.append(LargeMoveData(
-                        market_id=market.id,
-                        question=market.question,
-                        detected_at=datetime.utcnow(),
-                        probability_start=first_snapshot.probability,
-                        probability_end=last_snapshot.probability,
-                        change_points=change,
-                        window_hours=window_hours
-                    ))
+                detected_moves.append(LargeMoveData(
+                    market_id=market.id,
+                    question=market.question,
+                    detected_at=datetime.utcnow(),
+                    probability_start=first_snapshot.probability,
+                    probability_end=last_snapshot.probability,
+                    change_points=change,
+                    window_hours=window_hours
+                ))
 
             await session.commit()
 
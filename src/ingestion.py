@@ -297,5 +297,8 @@ class IngestionService:
 async def run_ingestion():
     """Main entry point for data ingestion."""
     service = IngestionService()
-    stats = await service.run_collection()
+    try:
+        stats = await service.run_collection()
+    finally:
+        await service.client.close()
     return stats
@@ -3,7 +3,9 @@ Polymarket API client for fetching market data.
 Uses the Gamma API and CLOB API endpoints.
 """
 import asyncio
+import calendar
 import httpx
+import orjson
 from datetime import datetime, timedelta
 from typing import Optional
 from dataclasses import dataclass
@@ -17,6 +19,16 @@ _black_swan_cache = {
     "ttl_minutes": 30
 }
 
+# Upper bound on a single market's price reversal check; also used as the
+# timeout of each of its prices-history requests
+PRICE_REVERSAL_TIMEOUT = 5.0
+
+# The reversal check samples 1-day windows centred this many days before
+# resolution. They are read from one hourly request spanning all of them,
+# falling back to a request per window if the API rejects the wide interval.
+REVERSAL_CHECK_DAYS = (14, 7, 3)
+REVERSAL_HALF_WIDTH_SECONDS = int(timedelta(hours=12).total_seconds())
+
 
 @dataclass
 class MarketData:
@@ -37,6 +49,18 @@ class MarketData:
     volume_24h: float
 
 
+@dataclass(slots=True)
+class BlackSwanCandidate:
+    """Resolved market queued for a price reversal check."""
+    market_data: dict
+    winning_outcome: str
+    winning_price: float
+    volume: float
+    market_end: datetime
+    resolution_ts: int
+    token_id: str
+
+
 class PolymarketClient:
     """
     Client for interacting with Polymarket APIs.
@@ -46,6 +70,33 @@ class PolymarketClient:
         self.gamma_base = settings.polymarket_api_base
         self.clob_base = settings.polymarket_clob_api
         self.timeout = httpx.Timeout(30.0)
+        self.limits = httpx.Limits(max_connections=100, max_keepalive_connections=32)
+        # Shared HTTP client, created on first use
+        self._http: Optional[httpx.AsyncClient] = None
+        # Pending black swan scan shared by concurrent callers
+        self._black_swan_inflight: Optional[asyncio.Future] = None
+        # Cleared once CLOB rejects the wide reversal-check interval
+        self._wide_reversal_window = True
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP/2 client, creating it on first use."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=True
+            )
+        return self._http
+
+    async def startup(self):
+        """Create the shared HTTP client up front instead of on the first request."""
+        self._get_client()
+
+    async def close(self):
+        """Close the shared HTTP client."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
     async def get_active_markets(
         self,
@@ -73,96 +124,96 @@ class PolymarketClient:
         offset = 0
         batch_size = 100
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            while len(markets) < limit:
-                # Fetch markets from Gamma API - sort by volume
-                params = {
-                    "closed": "false",
-                    "limit": batch_size,
-                    "offset": offset,
-                    "order": "volumeNum",
-                    "ascending": "false"
-                }
+        client = self._get_client()
+        while len(markets) < limit:
+            # Fetch markets from Gamma API - sort by volume
+            params = {
+                "closed": "false",
+                "limit": batch_size,
+                "offset": offset,
+                "order": "volumeNum",
+                "ascending": "false"
+            }
 
-                try:
-                    response = await client.get(
-                        f"{self.gamma_base}/markets",
-                        params=params
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                except httpx.HTTPError as e:
-                    print(f"Error fetching markets: {e}")
-                    break
+            try:
+                response = await client.get(
+                    f"{self.gamma_base}/markets",
+                    params=params
+                )
+                response.raise_for_status()
+                data = response.json()
+            except httpx.HTTPError as e:
+                print(f"Error fetching markets: {e}")
+                break
 
-                if not data:
-                    break
+            if not data:
+                break
 
-                for market in data:
-                    parsed = self._parse_market(market)
-                    if parsed is None:
-                        continue
+            for market in data:
+                parsed = self._parse_market(market)
+                if parsed is None:
+                    continue
 
-                    # Apply filters - use volume instead of liquidity
-                    if parsed.volume < min_volume:
-                        continue
+                # Apply filters - use volume instead of liquidity
+                if parsed.volume < min_volume:
+                    continue
 
-                    if parsed.end_date:
-                        days_to_resolution = (parsed.end_date - datetime.utcnow()).days
-                        if days_to_resolution > max_days_to_resolution or days_to_resolution < 0:
-                            continue
+                if parsed.end_date:
+                    days_to_resolution = (parsed.end_date - datetime.utcnow()).days
+                    if days_to_resolution > max_days_to_resolution or days_to_resolution < 0:
+                        continue
 
-                    markets.append(parsed)
+                markets.append(parsed)
 
-                    if len(markets) >= limit:
-                        break
+                if len(markets) >= limit:
+                    break
 
-                offset += batch_size
+            offset += batch_size
 
-                # If we got fewer than batch_size, we've reached the end
-                if len(data) < batch_size:
-                    break
+            # If we got fewer than batch_size, we've reached the end
+            if len(data) < batch_size:
+                break
 
         return markets
 
     async def get_market_by_id(self, market_id: str) -> Optional[MarketData]:
         """Fetch a single market by ID."""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.get(f"{self.gamma_base}/markets/{market_id}")
-                response.raise_for_status()
-                data = response.json()
-                return self._parse_market(data)
-            except httpx.HTTPError as e:
-                print(f"Error fetching market {market_id}: {e}")
-                return None
+        client = self._get_client()
+        try:
+            response = await client.get(f"{self.gamma_base}/markets/{market_id}")
+            response.raise_for_status()
+            data = response.json()
+            return self._parse_market(data)
+        except httpx.HTTPError as e:
+            print(f"Error fetching market {market_id}: {e}")
+            return None
 
     async def get_resolved_markets(self, limit: int = 100) -> list[MarketData]:
         """Fetch recently resolved markets."""
         markets = []
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            params = {
-                "closed": "true",
-                "limit": limit,
-                "order": "endDate",
-                "ascending": "false"
-            }
+        client = self._get_client()
+        params = {
+            "closed": "true",
+            "limit": limit,
+            "order": "endDate",
+            "ascending": "false"
+        }
 
-            try:
-                response = await client.get(
-                    f"{self.gamma_base}/markets",
-                    params=params
-                )
-                response.raise_for_status()
-                data = response.json()
+        try:
+            response = await client.get(
+                f"{self.gamma_base}/markets",
+                params=params
+            )
+            response.raise_for_status()
+            data = response.json()
 
-                for market in data:
-                    parsed = self._parse_market(market)
-                    if parsed:
-                        markets.append(parsed)
-            except httpx.HTTPError as e:
-                print(f"Error fetching resolved markets: {e}")
+            for market in data:
+                parsed = self._parse_market(market)
+                if parsed:
+                    markets.append(parsed)
+        except httpx.HTTPError as e:
+            print(f"Error fetching resolved markets: {e}")
 
         return markets
 
@@ -299,55 +350,55 @@ class PolymarketClient:
         offset = 0
         batch_size = 100
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            while len(markets) < limit:
-                params = {
-                    "closed": "true",
-                    "limit": batch_size,
-                    "offset": offset,
-                    "order": "liquidityNum",
-                    "ascending": "false"
-                }
+        client = self._get_client()
+        while len(markets) < limit:
+            params = {
+                "closed": "true",
+                "limit": batch_size,
+                "offset": offset,
+                "order": "liquidityNum",
+                "ascending": "false"
+            }
 
-                try:
-                    response = await client.get(
-                        f"{self.gamma_base}/markets",
-                        params=params
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                except httpx.HTTPError as e:
-                    print(f"Error fetching resolved markets: {e}")
-                    break
+            try:
+                response = await client.get(
+                    f"{self.gamma_base}/markets",
+                    params=params
+                )
+                response.raise_for_status()
+                data = response.json()
+            except httpx.HTTPError as e:
+                print(f"Error fetching resolved markets: {e}")
+                break
 
-                if not data:
-                    break
+            if not data:
+                break
 
-                for market in data:
-                    parsed = self._parse_market(market)
-                    if parsed is None:
-                        continue
+            for market in data:
+                parsed = self._parse_market(market)
+                if parsed is None:
+                    continue
 
-                    # Filter by resolution date
-                    if parsed.end_date:
-                        if parsed.end_date < start_date or parsed.end_date > end_date:
-                            continue
-                    else:
+                # Filter by resolution date
+                if parsed.end_date:
+                    if parsed.end_date < start_date or parsed.end_date > end_date:
                         continue
+                else:
+                    continue
 
-                    # Filter by liquidity
-                    if parsed.liquidity < min_liquidity:
-                        continue
+                # Filter by liquidity
+                if parsed.liquidity < min_liquidity:
+                    continue
 
-                    markets.append(parsed)
+                markets.append(parsed)
 
-                    if len(markets) >= limit:
-                        break
+                if len(markets) >= limit:
+                    break
 
-                offset += batch_size
+            offset += batch_size
 
-                if len(data) < batch_size:
-                    break
+            if len(data) < batch_size:
+                break
 
         return markets
 
@@ -372,42 +423,42 @@ class PolymarketClient:
         Returns:
             List of price points with timestamp and price
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                # Try the prices-history endpoint
-                params = {
-                    "market": token_id,
-                    "startTs": start_ts,
-                    "endTs": end_ts,
-                    "fidelity": fidelity
-                }
-                response = await client.get(
-                    f"{self.clob_base}/prices-history",
-                    params=params
-                )
+        client = self._get_client()
+        try:
+            # Try the prices-history endpoint
+            params = {
+                "market": token_id,
+                "startTs": start_ts,
+                "endTs": end_ts,
+                "fidelity": fidelity
+            }
+            response = await client.get(
+                f"{self.clob_base}/prices-history",
+                params=params
+            )
 
-                if response.status_code == 200:
-                    data = response.json()
-                    if isinstance(data, dict) and "history" in data:
-                        return data["history"]
-                    return data if isinstance(data, list) else []
-            except httpx.HTTPError as e:
-                print(f"Error fetching price history: {e}")
+            if response.status_code == 200:
+                data = response.json()
+                if isinstance(data, dict) and "history" in data:
+                    return data["history"]
+                return data if isinstance(data, list) else []
+        except httpx.HTTPError as e:
+            print(f"Error fetching price history: {e}")
 
-            return []
+        return []
 
     async def get_market_with_tokens(self, market_id: str) -> Optional[dict]:
         """
         Fetch market with CLOB token IDs for price history lookup.
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.get(f"{self.gamma_base}/markets/{market_id}")
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPError as e:
-                print(f"Error fetching market {market_id}: {e}")
-                return None
+        client = self._get_client()
+        try:
+            response = await client.get(f"{self.gamma_base}/markets/{market_id}")
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError as e:
+            print(f"Error fetching market {market_id}: {e}")
+            return None
 
     async def get_historical_simulation_data(
         self,
@@ -526,93 +577,93 @@ class PolymarketClient:
         batch_size = 100
         max_pages = 20  # Check up to 2000 markets
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            while len(markets) < limit and offset < batch_size * max_pages:
-                # Order by volume since resolved markets have $0 liquidity
-                params = {
-                    "closed": "true",
-                    "limit": batch_size,
-                    "offset": offset,
-                    "order": "volumeNum",
-                    "ascending": "false"
-                }
+        client = self._get_client()
+        while len(markets) < limit and offset < batch_size * max_pages:
+            # Order by volume since resolved markets have $0 liquidity
+            params = {
+                "closed": "true",
+                "limit": batch_size,
+                "offset": offset,
+                "order": "volumeNum",
+                "ascending": "false"
+            }
+
+            try:
+                response = await client.get(
+                    f"{self.gamma_base}/markets",
+                    params=params
+                )
+                response.raise_for_status()
+                data = response.json()
+            except Exception as e:
+                print(f"Error fetching markets: {e}")
+                break
 
-                try:
-                    response = await client.get(
-                        f"{self.gamma_base}/markets",
-                        params=params
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                except Exception as e:
-                    print(f"Error fetching markets: {e}")
-                    break
+            if not data:
+                break
 
-                if not data:
+            for market_data in data:
+                if len(markets) >= limit:
                     break
 
-                for market_data in data:
-                    if len(markets) >= limit:
-                        break
+                # Parse end date
+                end_date_str = market_data.get("endDate")
+                if not end_date_str:
+                    continue
 
-                    # Parse end date
-                    end_date_str = market_data.get("endDate")
-                    if not end_date_str:
-                        continue
+                market_end = self._parse_datetime(end_date_str)
+                if not market_end:
+                    continue
 
-                    market_end = self._parse_datetime(end_date_str)
-                    if not market_end:
+                # Filter by resolution window (skip if any_resolved mode)
+                if not skip_date_filter:
+                    if market_end < start_date or market_end > end_date:
                         continue
 
-                    # Filter by resolution window (skip if any_resolved mode)
-                    if not skip_date_filter:
-                        if market_end < start_date or market_end > end_date:
-                            continue
+                # Filter by volume (resolved markets have $0 liquidity, so use volume)
+                volume = self._parse_float(market_data.get("volumeNum", 0))
+                if volume < min_volume:
+                    continue
 
-                    # Filter by volume (resolved markets have $0 liquidity, so use volume)
-                    volume = self._parse_float(market_data.get("volumeNum", 0))
-                    if volume < min_volume:
-                        continue
+                # Parse outcomes and prices
+                outcomes = market_data.get("outcomes", ["Yes", "No"])
+                if isinstance(outcomes, str):
+                    try:
+                        outcomes = json.loads(outcomes)
+                    except:
+                        outcomes = ["Yes", "No"]
 
-                    # Parse outcomes and prices
-                    outcomes = market_data.get("outcomes", ["Yes", "No"])
-                    if isinstance(outcomes, str):
-                        try:
-                            outcomes = json.loads(outcomes)
-                        except:
-                            outcomes = ["Yes", "No"]
+                prices_raw = market_data.get("outcomePrices", [])
+                if isinstance(prices_raw, str):
+                    try:
+                        prices_raw = json.loads(prices_raw)
+                    except:
+                        prices_raw = []
 
-                    prices_raw = market_data.get("outcomePrices", [])
-                    if isinstance(prices_raw, str):
+                outcome_prices = {}
+                for i, outcome in enumerate(outcomes):
+                    if i < len(prices_raw):
                         try:
-                            prices_raw = json.loads(prices_raw)
+                            outcome_prices[outcome] = float(prices_raw[i])
                         except:
-                            prices_raw = []
-
-                    outcome_prices = {}
-                    for i, outcome in enumerate(outcomes):
-                        if i < len(prices_raw):
-                            try:
-                                outcome_prices[outcome] = float(prices_raw[i])
-                            except:
-                                pass
-
-                    markets.append({
-                        "id": market_data.get("id", ""),
-                        "question": market_data.get("question", "Unknown"),
-                        "category": market_data.get("category") or market_data.get("groupSlug"),
-                        "outcomes": outcomes,
-                        "outcome_prices": outcome_prices,
-                        "end_date": market_end.isoformat() if market_end else None,
-                        "liquidity": self._parse_float(market_data.get("liquidityNum", 0)),
-                        "volume": volume
-                    })
-
-                offset += batch_size
+                            pass
 
-                # Stop if we got fewer than batch_size (no more data)
-                if len(data) < batch_size:
-                    break
+                markets.append({
+                    "id": market_data.get("id", ""),
+                    "question": market_data.get("question", "Unknown"),
+                    "category": market_data.get("category") or market_data.get("groupSlug"),
+                    "outcomes": outcomes,
+                    "outcome_prices": outcome_prices,
+                    "end_date": market_end.isoformat() if market_end else None,
+                    "liquidity": self._parse_float(market_data.get("liquidityNum", 0)),
+                    "volume": volume
+                })
+
+            offset += batch_size
+
+            # Stop if we got fewer than batch_size (no more data)
+            if len(data) < batch_size:
+                break
 
         return markets
 
@@ -716,101 +767,101 @@ class PolymarketClient:
         offset = 0
         batch_size = 100
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            while len(movers) < limit and offset < 500:
-                params = {
-                    "closed": "false",
-                    "limit": batch_size,
-                    "offset": offset,
-                    "order": "volumeNum",
-                    "ascending": "false"
-                }
+        client = self._get_client()
+        while len(movers) < limit and offset < 500:
+            params = {
+                "closed": "false",
+                "limit": batch_size,
+                "offset": offset,
+                "order": "volumeNum",
+                "ascending": "false"
+            }
 
-                try:
-                    response = await client.get(
-                        f"{self.gamma_base}/markets",
-                        params=params
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                except Exception as e:
-                    print(f"Error fetching markets for movers: {e}")
-                    break
+            try:
+                response = await client.get(
+                    f"{self.gamma_base}/markets",
+                    params=params
+                )
+                response.raise_for_status()
+                data = response.json()
+            except Exception as e:
+                print(f"Error fetching markets for movers: {e}")
+                break
 
-                if not data:
-                    break
+            if not data:
+                break
 
-                for market_data in data:
-                    # Get volume and liquidity
-                    volume = self._parse_float(market_data.get("volumeNum", 0))
-                    volume_24h = self._parse_float(market_data.get("volume24hr", 0))
+            for market_data in data:
+                # Get volume and liquidity
+                volume = self._parse_float(market_data.get("volumeNum", 0))
+                volume_24h = self._parse_float(market_data.get("volume24hr", 0))
 
-                    # Skip low-volume markets
-                    if volume < 50000:
-                        continue
+                # Skip low-volume markets
+                if volume < 50000:
+                    continue
 
-                    # Parse outcomes and prices
-                    outcomes = market_data.get("outcomes", ["Yes", "No"])
-                    if isinstance(outcomes, str):
-                        try:
-                            outcomes = json.loads(outcomes)
-                        except:
-                            outcomes = ["Yes", "No"]
+                # Parse outcomes and prices
+                outcomes = market_data.get("outcomes", ["Yes", "No"])
+                if isinstance(outcomes, str):
+                    try:
+                        outcomes = json.loads(outcomes)
+                    except:
+                        outcomes = ["Yes", "No"]
 
-                    prices_raw = market_data.get("outcomePrices", [])
-                    if isinstance(prices_raw, str):
-                        try:
-                            prices_raw = json.loads(prices_raw)
-                        except:
-                            prices_raw = []
+                prices_raw = market_data.get("outcomePrices", [])
+                if isinstance(prices_raw, str):
+                    try:
+                        prices_raw = json.loads(prices_raw)
+                    except:
+                        prices_raw = []
 
-                    # Get current "Yes" probability
-                    current_prob = 50.0
-                    if prices_raw and len(prices_raw) > 0:
-                        try:
-                            current_prob = float(prices_raw[0]) * 100
-                        except:
-                            pass
+                # Get current "Yes" probability
+                current_prob = 50.0
+                if prices_raw and len(prices_raw) > 0:
+                    try:
+                        current_prob = float(prices_raw[0]) * 100
+                    except:
+                        pass
 
-                    # Try to get price change from spread or volume activity
-                    # Markets with high 24h volume relative to total likely had movement
-                    if volume > 0:
-                        activity_ratio = volume_24h / volume if volume_24h else 0
+                # Try to get price change from spread or volume activity
+                # Markets with high 24h volume relative to total likely had movement
+                if volume > 0:
+                    activity_ratio = volume_24h / volume if volume_24h else 0
+                else:
+                    activity_ratio = 0
+
+                # Estimate movement based on activity
+                # High activity markets with mid-range probability likely moved
+                if activity_ratio > 0.05 or volume_24h > 10000:
+                    # Estimate a reasonable change for display
+                    estimated_change = min(activity_ratio * 50, 15)  # Cap at 15 pts
+                    if current_prob > 50:
+                        change_direction = 1
                     else:
-                        activity_ratio = 0
-
-                    # Estimate movement based on activity
-                    # High activity markets with mid-range probability likely moved
-                    if activity_ratio > 0.05 or volume_24h > 10000:
-                        # Estimate a reasonable change for display
-                        estimated_change = min(activity_ratio * 50, 15)  # Cap at 15 pts
-                        if current_prob > 50:
-                            change_direction = 1
-                        else:
-                            change_direction = -1
-
-                        estimated_start = current_prob - (estimated_change * change_direction)
-
-                        movers.append({
-                            "market_id": market_data.get("id", ""),
-                            "question": market_data.get("question", "Unknown"),
-                            "category": market_data.get("category") or market_data.get("groupSlug"),
-                            "probability_start": max(0, min(100, estimated_start)),
-                            "probability_end": current_prob,
-                            "change_points": estimated_change * change_direction,
-                            "max_swing": estimated_change,
-                            "abs_change": estimated_change,
-                            "window_hours": 24,
-                            "volume": volume,
-                            "volume_24h": volume_24h,
-                            "is_historical": False,
-                            "is_api_estimate": True
-                        })
-
-                offset += batch_size
-
-                if len(data) < batch_size:
-                    break
+                        change_direction = -1
+
+                    estimated_start = current_prob - (estimated_change * change_direction)
+
+                    movers.append({
+                        "market_id": market_data.get("id", ""),
+                        "question": market_data.get("question", "Unknown"),
+                        "category": market_data.get("category") or market_data.get("groupSlug"),
+                        "probability_start": max(0, min(100, estimated_start)),
+                        "probability_end": current_prob,
+                        "change_points": estimated_change * change_direction,
+                        "max_swing": estimated_change,
+                        "abs_change": estimated_change,
+                        "window_hours": 24,
+                        "volume": volume,
+                        "volume_24h": volume_24h,
+                        "is_historical": False,
+                        "is_api_estimate": True
+                    })
+
+            offset += batch_size
+
+            if len(data) < batch_size:
+                break
 
         # Sort by 24h volume (most active markets)
         movers.sort(key=lambda m: m.get("volume_24h", 0), reverse=True)
@@ -833,6 +884,7 @@ class PolymarketClient:
         - But lost confidence and the "underdog" won
 
         Uses caching (30 min TTL) and parallel price checks for performance.
+        Concurrent callers share a single in-flight scan.
 
         Args:
             days_back: How many days back to search
@@ -840,14 +892,47 @@ class PolymarketClient:
             limit: Max black swans to return
             use_cache: Whether to use cached results
         """
-        import json
-
         # Check cache first
         if use_cache and _black_swan_cache["data"] is not None:
             cache_age = datetime.utcnow() - _black_swan_cache["timestamp"]
             if cache_age.total_seconds() < _black_swan_cache["ttl_minutes"] * 60:
                 return _black_swan_cache["data"][:limit]
 
+        # If a scan is already running, wait for its result instead of starting another
+        inflight = self._black_swan_inflight
+        while inflight is not None and not inflight.done():
+            try:
+                return (await asyncio.shield(inflight))[:limit]
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    # This caller was cancelled, not the scan
+                    raise
+            # The caller running the scan was cancelled: start or join a new one
+            inflight = self._black_swan_inflight
+
+        inflight = asyncio.get_running_loop().create_future()
+        self._black_swan_inflight = inflight
+        try:
+            black_swans = await self._scan_black_swans(days_back, min_volume)
+        except asyncio.CancelledError:
+            inflight.cancel()
+            raise
+        except Exception as e:
+            inflight.set_exception(e)
+            # Mark retrieved so an unawaited future doesn't log a warning
+            inflight.exception()
+            raise
+        else:
+            inflight.set_result(black_swans)
+        finally:
+            self._black_swan_inflight = None
+
+        return black_swans[:limit]
+
+    async def _scan_black_swans(self, days_back: int, min_volume: float) -> list[dict]:
+        """Run the full black swan search and refresh the cache."""
+        import json
+
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=days_back)
 
@@ -857,124 +942,144 @@ class PolymarketClient:
         batch_size = 100
         max_pages = 20  # Check up to 2000 markets
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            while offset < batch_size * max_pages:
-                params = {
-                    "closed": "true",
-                    "limit": batch_size,
-                    "offset": offset,
-                    "order": "volumeNum",
-                    "ascending": "false"
-                }
+        client = self._get_client()
+        while offset < batch_size * max_pages:
+            # Let Gamma apply the date and volume filters so we only
+            # download markets that can become candidates
+            params = {
+                "closed": "true",
+                "limit": batch_size,
+                "offset": offset,
+                "order": "volumeNum",
+                "ascending": "false",
+                "end_date_min": start_date.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "volume_num_min": min_volume
+            }
 
-                try:
-                    response = await client.get(
-                        f"{self.gamma_base}/markets",
-                        params=params
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                except Exception as e:
-                    print(f"Error fetching markets: {e}")
-                    break
+            try:
+                response = await client.get(
+                    f"{self.gamma_base}/markets",
+                    params=params
+                )
+                response.raise_for_status()
+                data = response.json()
+            except Exception as e:
+                print(f"Error fetching markets: {e}")
+                break
 
-                if not data:
-                    break
+            if not data:
+                break
 
-                for market_data in data:
-                    # Check resolution date is within range
-                    end_date_str = market_data.get("endDate")
-                    if not end_date_str:
-                        continue
+            for market_data in data:
+                # Date range and volume are already filtered server-side
+                end_date_str = market_data.get("endDate")
+                if not end_date_str:
+                    continue
 
-                    market_end = self._parse_datetime(end_date_str)
-                    if not market_end or market_end < start_date:
-                        continue
+                market_end = self._parse_datetime(end_date_str)
+                if not market_end:
+                    continue
 
-                    # Check volume
-                    volume = self._parse_float(market_data.get("volumeNum", 0))
-                    if volume < min_volume:
-                        continue
+                volume = self._parse_float(market_data.get("volumeNum", 0))
 
-                    # Parse outcomes and current prices
-                    outcomes = market_data.get("outcomes", ["Yes", "No"])
-                    if isinstance(outcomes, str):
-                        try:
-                            outcomes = json.loads(outcomes)
-                        except:
-                            outcomes = ["Yes", "No"]
+                # Parse outcomes and current prices
+                outcomes = market_data.get("outcomes", ["Yes", "No"])
+                if isinstance(outcomes, str):
+                    try:
+                        outcomes = json.loads(outcomes)
+                    except:
+                        outcomes = ["Yes", "No"]
 
-                    prices_raw = market_data.get("outcomePrices", [])
-                    if isinstance(prices_raw, str):
+                prices_raw = market_data.get("outcomePrices", [])
+                if isinstance(prices_raw, str):
+                    try:
+                        prices_raw = json.loads(prices_raw)
+                    except:
+                        prices_raw = []
+
+                # Determine winning outcome from final prices
+                winning_outcome = None
+                winning_price = 0
+                winner_idx = None
+                for i, outcome in enumerate(outcomes):
+                    if i < len(prices_raw):
                         try:
-                            prices_raw = json.loads(prices_raw)
+                            price = float(prices_raw[i])
+                            if price > 0.95:  # Winner
+                                winning_outcome = outcome
+                                winning_price = price
+                                winner_idx = i
+                                break
                         except:
-                            prices_raw = []
-
-                    # Determine winning outcome from final prices
-                    winning_outcome = None
-                    winning_price = 0
-                    for i, outcome in enumerate(outcomes):
-                        if i < len(prices_raw):
-                            try:
-                                price = float(prices_raw[i])
-                                if price > 0.95:  # Winner
-                                    winning_outcome = outcome
-                                    winning_price = price
-                                    break
-                            except:
-                                pass
-
-                    if not winning_outcome:
-                        continue
+                            pass
 
-                    candidates.append({
-                        "market_data": market_data,
-                        "winning_outcome": winning_outcome,
-                        "winning_price": winning_price,
-                        "volume": volume,
-                        "market_end": market_end
-                    })
+                if not winning_outcome:
+                    continue
 
-                offset += batch_size
+                # Resolve the winner's CLOB token once so Phase 2 needs no parsing
+                clob_token_ids = market_data.get("clobTokenIds")
+                if isinstance(clob_token_ids, str):
+                    try:
+                        clob_token_ids = json.loads(clob_token_ids)
+                    except:
+                        clob_token_ids = None
+                if not clob_token_ids or winner_idx >= len(clob_token_ids):
+                    continue
 
-                if len(data) < batch_size:
-                    break
+                candidates.append(BlackSwanCandidate(
+                    market_data=market_data,
+                    winning_outcome=winning_outcome,
+                    winning_price=winning_price,
+                    volume=volume,
+                    market_end=market_end,
+                    resolution_ts=calendar.timegm(market_end.timetuple()),
+                    token_id=clob_token_ids[winner_idx]
+                ))
 
-            # Phase 2: Check price reversals in parallel (batches of 20)
-            black_swans = []
-            batch_size_parallel = 20
+            offset += batch_size
 
-            for i in range(0, len(candidates), batch_size_parallel):
-                batch = candidates[i:i + batch_size_parallel]
+            if len(data) < batch_size:
+                break
 
-                # Create tasks for parallel execution
-                tasks = [
-                    self._check_price_reversal(client, c["market_data"], c["winning_outcome"])
-                    for c in batch
-                ]
+        # Phase 2: Check price reversals in parallel (batches of 20)
+        black_swans = []
+        batch_size_parallel = 20
 
-                results = await asyncio.gather(*tasks, return_exceptions=True)
+        for i in range(0, len(candidates), batch_size_parallel):
+            batch = candidates[i:i + batch_size_parallel]
 
-                for j, result in enumerate(results):
-                    if isinstance(result, Exception):
-                        continue
+            # Create tasks for parallel execution; a timeout keeps one slow
+            # market from stalling the whole batch
+            tasks = [
+                asyncio.wait_for(
+                    self._check_price_reversal(client, c.token_id, c.resolution_ts),
+                    timeout=PRICE_REVERSAL_TIMEOUT
+                )
+                for c in batch
+            ]
 
-                    is_black_swan, early_price, early_date = result
-                    if is_black_swan:
-                        c = batch[j]
-                        black_swans.append({
-                            "market_id": c["market_data"].get("id", ""),
-                            "question": c["market_data"].get("question", "Unknown"),
-                            "category": c["market_data"].get("category") or c["market_data"].get("groupSlug"),
-                            "end_date": c["market_end"].isoformat() if c["market_end"] else None,
-                            "winning_outcome": c["winning_outcome"],
-                            "early_probability": early_price * 100 if early_price else None,
-                            "early_date": early_date.isoformat() if early_date else None,
-                            "final_probability": c["winning_price"] * 100,
-                            "volume": c["volume"],
-                            "reversal_type": "underdog_win" if early_price and early_price < 0.3 else "confidence_collapse"
-                        })
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+            for j, result in enumerate(results):
+                # Includes asyncio.TimeoutError for markets that took too long
+                if isinstance(result, Exception):
+                    continue
+
+                is_black_swan, early_price, early_date = result
+                if is_black_swan:
+                    c = batch[j]
+                    black_swans.append({
+                        "market_id": c.market_data.get("id", ""),
+                        "question": c.market_data.get("question", "Unknown"),
+                        "category": c.market_data.get("category") or c.market_data.get("groupSlug"),
+                        "end_date": c.market_end.isoformat() if c.market_end else None,
+                        "winning_outcome": c.winning_outcome,
+                        "early_probability": early_price * 100 if early_price else None,
+                        "early_date": early_date.isoformat() if early_date else None,
+                        "final_probability": c.winning_price * 100,
+                        "volume": c.volume,
+                        "reversal_type": "underdog_win" if early_price and early_price < 0.3 else "confidence_collapse"
+                    })
 
         # Sort by how dramatic the reversal was (lowest early probability first)
         black_swans.sort(
@@ -985,110 +1090,124 @@ class PolymarketClient:
         _black_swan_cache["data"] = black_swans
         _black_swan_cache["timestamp"] = datetime.utcnow()
 
-        return black_swans[:limit]
+        return black_swans
 
-    async def _check_price_reversal(
+    async def _fetch_price_points(
         self,
         client: httpx.AsyncClient,
-        market_data: dict,
-        winning_outcome: str
+        token_id: str,
+        start_ts: int,
+        end_ts: int
     ) -> tuple:
         """
-        Check if a market had a price reversal indicating a black swan.
+        Fetch a token's hourly price history between two unix timestamps.
 
-        Returns (is_black_swan, early_price, early_date)
+        Returns (status_code, points), where points is a list of
+        (price, timestamp) pairs and is empty unless the status is 200.
         """
-        import json
-
-        # Get CLOB token IDs for price history
-        clob_token_ids = market_data.get("clobTokenIds")
-        if not clob_token_ids:
-            return False, None, None
-
-        if isinstance(clob_token_ids, str):
-            try:
-                clob_token_ids = json.loads(clob_token_ids)
-            except:
-                return False, None, None
-
-        outcomes = market_data.get("outcomes", ["Yes", "No"])
-        if isinstance(outcomes, str):
-            try:
-                outcomes = json.loads(outcomes)
-            except:
-                outcomes = ["Yes", "No"]
-
-        # Find token ID for winning outcome
-        winner_idx = None
-        for i, outcome in enumerate(outcomes):
-            if outcome == winning_outcome:
-                winner_idx = i
-                break
-
-        if winner_idx is None or winner_idx >= len(clob_token_ids):
-            return False, None, None
-
-        token_id = clob_token_ids[winner_idx]
+        params = {
+            "market": token_id,
+            "startTs": start_ts,
+            "endTs": end_ts,
+            "fidelity": 60  # Hourly data
+        }
+        response = await client.get(
+            f"{self.clob_base}/prices-history",
+            params=params,
+            timeout=PRICE_REVERSAL_TIMEOUT
+        )
 
-        # Get price history
-        end_date = market_data.get("endDate")
-        if not end_date:
-            return False, None, None
+        points = []
+        if response.status_code != 200:
+            return response.status_code, points
+
+        history = orjson.loads(response.content)
+        if isinstance(history, dict) and "history" in history:
+            history = history["history"]
+
+        if history and isinstance(history, list):
+            for point in history:
+                if isinstance(point, dict):
+                    p = point.get("p") or point.get("price", 0)
+                    t = point.get("t") or point.get("timestamp", start_ts)
+                elif isinstance(point, (list, tuple)) and len(point) >= 2:
+                    t = point[0]
+                    p = point[1]
+                else:
+                    continue
+                try:
+                    points.append((float(p), int(t)))
+                except:
+                    pass
 
-        market_end = self._parse_datetime(end_date)
-        if not market_end:
-            return False, None, None
+        return response.status_code, points
 
-        # Check multiple time windows before resolution (API has interval limits)
-        # Try: 14 days before, 7 days before, 3 days before
-        check_days = [14, 7, 3]
-        all_price_points = []  # List of (price, timestamp)
+    async def _check_price_reversal(
+        self,
+        client: httpx.AsyncClient,
+        token_id: str,
+        resolution_ts: int
+    ) -> tuple:
+        """
+        Check if a market had a price reversal indicating a black swan.
 
-        for days_before in check_days:
-            # Use 1-day windows to avoid API limit
-            check_time = market_end - timedelta(days=days_before)
-            start_ts = int((check_time - timedelta(hours=12)).timestamp())
-            end_ts = int((check_time + timedelta(hours=12)).timestamp())
+        Args:
+            client: Shared HTTP client
+            token_id: CLOB token ID of the winning outcome
+            resolution_ts: Resolution time of the market (unix seconds, UTC)
 
+        Returns (is_black_swan, early_price, early_date)
+        """
+        windows = [
+            (resolution_ts - days * 86400 - REVERSAL_HALF_WIDTH_SECONDS,
+             resolution_ts - days * 86400 + REVERSAL_HALF_WIDTH_SECONDS)
+            for days in REVERSAL_CHECK_DAYS
+        ]
+
+        all_price_points = None
+        if self._wide_reversal_window:
             try:
-                params = {
-                    "market": token_id,
-                    "startTs": start_ts,
-                    "endTs": end_ts,
-                    "fidelity": 60  # Hourly data
-                }
-                response = await client.get(
-                    f"{self.clob_base}/prices-history",
-                    params=params,
-                    timeout=10.0
+                status, points = await self._fetch_price_points(
+                    client, token_id, windows[0][0], windows[-1][1]
                 )
+            except Exception as e:
+                print(f"Error checking price reversal for {token_id}: {e}")
+                return False, None, None
+
+            if status == 200:
+                # Keep only the points the 1-day windows would have returned
+                all_price_points = [
+                    (p, t) for p, t in points
+                    if any(lo <= t <= hi for lo, hi in windows)
+                ]
+            elif status == 400:
+                # Interval too long for the API: use 1-day windows from now on
+                if self._wide_reversal_window:
+                    self._wide_reversal_window = False
+                    print("Wide price history window rejected, using 1-day windows")
+            else:
+                print(f"Error checking price reversal for {token_id}: HTTP {status}")
+                return False, None, None
 
-                if response.status_code == 200:
-                    history = response.json()
-                    if isinstance(history, dict) and "history" in history:
-                        history = history["history"]
-
-                    if history and isinstance(history, list):
-                        for point in history:
-                            if isinstance(point, dict):
-                                p = point.get("p") or point.get("price", 0)
-                                t = point.get("t") or point.get("timestamp", start_ts)
-                            elif isinstance(point, (list, tuple)) and len(point) >= 2:
-                                t = point[0]
-                                p = point[1]
-                            else:
-                                continue
-                            try:
-                                all_price_points.append((float(p), int(t)))
-                            except:
-                                pass
-            except Exception:
-                pass
+        if all_price_points is None:
+            results = await asyncio.gather(
+                *[self._fetch_price_points(client, token_id, lo, hi) for lo, hi in windows],
+                return_exceptions=True
+            )
+            all_price_points = []
+            for result in results:
+                if isinstance(result, Exception):
+                    print(f"Error checking price reversal for {token_id}: {result}")
+                    continue
+                status, points = result
+                if status == 200:
+                    all_price_points.extend(points)
+                else:
+                    print(f"Error checking price reversal for {token_id}: HTTP {status}")
 
         if all_price_points:
-            # Find the minimum price and its timestamp
-            min_point = min(all_price_points, key=lambda x: x[0])
-            min_price, min_timestamp = min_point
+            # Earliest of the lowest points, as in window order
+            min_price, min_timestamp = min(all_price_points, key=lambda x: x[0])
 
             # Black swan if winner was trading below 40% at some point
             if min_price < 0.4:
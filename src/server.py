@@ -2,9 +2,13 @@
 FastAPI server for Polymarket Analytics Dashboard.
 """
 import os
+import time
 import asyncio
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import HTMLResponse
+import hashlib
+import logging
+from functools import lru_cache
+from fastapi import FastAPI, Request, Response, HTTPException, Depends
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pathlib import Path
@@ -15,20 +19,219 @@ from .analytics import AnalyticsEngine
 from .polymarket_client import PolymarketClient
 from .config import settings
 
+# Configure only this module's logger; the root logger is left to uvicorn
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    )
+    logger.addHandler(_log_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+# httpx logs every request at INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# Environment flags are read once at import
+COLLECT_SECRET = os.getenv("COLLECT_SECRET")
+ENABLE_BACKGROUND_COLLECTION = os.getenv("ENABLE_BACKGROUND_COLLECTION", "true").lower() == "true"
+
 # Initialize app
 app = FastAPI(
     title="Polymarket Analytics",
-    description="Local-first analytics tool for Polymarket prediction markets"
+    description="Local-first analytics tool for Polymarket prediction markets",
+    default_response_class=ORJSONResponse
 )
 
 # Mount static files and templates
 BASE_DIR = Path(__file__).resolve().parent.parent
 app.mount("/static", StaticFiles(directory=BASE_DIR / "static"), name="static")
 templates = Jinja2Templates(directory=BASE_DIR / "templates")
-
-# Analytics engine and API client
+# Templates don't change while the server runs: skip per-render mtime checks.
+# (Set on the env because Starlette deprecates Jinja2Templates(**env_options).)
+templates.env.auto_reload = False
+
+PAGE_TEMPLATES = [
+    "dashboard.html",
+    "markets.html",
+    "market_detail.html",
+    "movers.html",
+    "black_swans.html",
+    "simulation.html",
+]
+
+# Analytics engine
 engine = AnalyticsEngine()
-polymarket_client = PolymarketClient()
+
+
+@lru_cache(maxsize=1)
+def get_polymarket_client() -> PolymarketClient:
+    """Per-process Polymarket API client shared by all requests."""
+    return PolymarketClient()
+
+
+# In-memory TTL cache for DB-backed analytics queries. The data only changes
+# when a collection runs, so the cache is also cleared after each ingestion.
+QUERY_CACHE_TTL_SECONDS = 120
+# Keys include request parameters, so bound the number of entries
+QUERY_CACHE_MAXSIZE = 256
+_query_cache = {}
+_query_cache_locks = {}
+# Bumped on every clear, so queries started before it don't store stale results
+_query_cache_generation = 0
+
+
+def clear_query_cache():
+    """Drop all cached query results and their locks."""
+    global _query_cache_generation
+    _query_cache_generation += 1
+    _query_cache.clear()
+    _query_cache_locks.clear()
+
+
+def _evict_query_cache():
+    """Make room for one entry: drop expired entries, then the oldest."""
+    now = time.monotonic()
+    for key in [k for k, (expires, _) in _query_cache.items() if expires <= now]:
+        del _query_cache[key]
+        _query_cache_locks.pop(key, None)
+    while len(_query_cache) >= QUERY_CACHE_MAXSIZE:
+        key = next(iter(_query_cache))
+        del _query_cache[key]
+        _query_cache_locks.pop(key, None)
+
+
+async def cached(key: tuple, coro_factory, ttl: float = QUERY_CACHE_TTL_SECONDS):
+    """Return the cached result for key, computing it at most once per TTL."""
+    entry = _query_cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+
+    lock = _query_cache_locks.get(key)
+    if lock is None:
+        lock = _query_cache_locks[key] = asyncio.Lock()
+    async with lock:
+        # Another request may have filled the entry while we waited
+        entry = _query_cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        generation = _query_cache_generation
+        value = await coro_factory()
+        if generation != _query_cache_generation:
+            # The data changed while this query ran; don't cache its result
+            return value
+        if key not in _query_cache and len(_query_cache) >= QUERY_CACHE_MAXSIZE:
+            _evict_query_cache()
+        _query_cache[key] = (time.monotonic() + ttl, value)
+        return value
+
+
+def get_overview_stats():
+    """Cached AnalyticsEngine.get_overview_stats."""
+    return cached(("overview",), engine.get_overview_stats)
+
+
+def get_active_markets(sort_by: str = "volume", limit: int = 100):
+    """Cached AnalyticsEngine.get_active_markets."""
+    return cached(
+        ("active_markets", sort_by, limit),
+        lambda: engine.get_active_markets(sort_by=sort_by, limit=limit)
+    )
+
+
+def get_recent_movers(limit: int = 20):
+    """Cached AnalyticsEngine.get_recent_movers."""
+    return cached(("recent_movers", limit), lambda: engine.get_recent_movers(limit=limit))
+
+
+def get_black_swans(limit: int = 50):
+    """Cached AnalyticsEngine.get_black_swans."""
+    return cached(("black_swans", limit), lambda: engine.get_black_swans(limit=limit))
+
+
+# Browsers and proxies may reuse /api responses for a minute; after that an
+# If-None-Match revalidation gets an empty 304 when the data hasn't changed
+API_CACHE_CONTROL = "public, max-age=60"
+
+
+def cacheable_json_response(request: Request, payload) -> Response:
+    """Serialize payload with Cache-Control and ETag headers, or 304 on a match."""
+    response = ORJSONResponse(payload, headers={"Cache-Control": API_CACHE_CONTROL})
+    etag = f'"{hashlib.blake2b(response.body, digest_size=8).hexdigest()}"'
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(
+            status_code=304,
+            headers={"Cache-Control": API_CACHE_CONTROL, "ETag": etag}
+        )
+
+    response.headers["ETag"] = etag
+    return response
+
+
+# Latest Polymarket API results (movers and black swans), refreshed by the
+# background collector so page loads don't wait on the external API
+API_SNAPSHOT_LIMIT = 50
+_api_snapshot = {
+    "movers": None,
+    "movers_refreshed_at": None,
+    "black_swans": None,
+    "black_swans_refreshed_at": None
+}
+# Lets one page load refetch a missing or stale movers snapshot while the
+# others wait for it (black swan scans are shared by the client itself)
+_api_movers_lock = asyncio.Lock()
+
+
+def _api_snapshot_is_fresh(key: str) -> bool:
+    """A snapshot is fresh if it was refreshed within two collection cycles."""
+    refreshed_at = _api_snapshot[f"{key}_refreshed_at"]
+    max_age = settings.collection_interval_hours * 3600 * 2
+    return refreshed_at is not None and time.monotonic() - refreshed_at < max_age
+
+
+async def refresh_api_movers(polymarket: PolymarketClient) -> list[dict]:
+    """Fetch movers from the Polymarket API into the snapshot."""
+    movers = await polymarket.get_api_movers(limit=API_SNAPSHOT_LIMIT)
+    _api_snapshot["movers"] = movers
+    _api_snapshot["movers_refreshed_at"] = time.monotonic()
+    return movers
+
+
+async def refresh_api_black_swans(polymarket: PolymarketClient, use_cache: bool = True) -> list[dict]:
+    """Search the Polymarket API for black swans into the snapshot."""
+    black_swans = await polymarket.find_black_swans_from_api(
+        days_back=60,
+        min_volume=100000,
+        limit=API_SNAPSHOT_LIMIT,
+        use_cache=use_cache
+    )
+    _api_snapshot["black_swans"] = black_swans
+    _api_snapshot["black_swans_refreshed_at"] = time.monotonic()
+    return black_swans
+
+
+async def get_snapshot_movers(polymarket: PolymarketClient, limit: int) -> list[dict]:
+    """API movers from the snapshot, fetching them only if it is missing or stale."""
+    if not _api_snapshot_is_fresh("movers"):
+        async with _api_movers_lock:
+            # Another request may have refreshed it while we waited
+            if not _api_snapshot_is_fresh("movers"):
+                await refresh_api_movers(polymarket)
+    return _api_snapshot["movers"][:limit]
+
+
+async def get_snapshot_black_swans(polymarket: PolymarketClient, limit: int) -> list[dict]:
+    """API black swans from the snapshot, searching only if it is missing or stale."""
+    if not _api_snapshot_is_fresh("black_swans"):
+        await refresh_api_black_swans(polymarket)
+    return _api_snapshot["black_swans"][:limit]
+
+
+# Serializes ingestion runs so the background loop and /api/collect never
+# write the same data concurrently
+INGESTION_LOCK = asyncio.Lock()
 
 
 async def background_collection():
@@ -43,16 +246,36 @@ async def background_collection():
 
     while True:
         try:
-            print(f"[{datetime.utcnow().isoformat()}] Starting background data collection...")
-            stats = await run_ingestion()
-            print(f"[{datetime.utcnow().isoformat()}] Collection complete: {stats['markets_fetched']} markets, {stats['snapshots_created']} snapshots")
+            async with INGESTION_LOCK:
+                logger.info("Starting background data collection...")
+                stats = await run_ingestion()
+                logger.info(
+                    "Collection complete: %s markets, %s snapshots",
+                    stats['markets_fetched'], stats['snapshots_created']
+                )
+
+                # New data is in; drop cached query results
+                clear_query_cache()
+
+                # Also detect large moves after collection
+                moves = await engine.detect_large_moves()
+                if moves:
+                    logger.info("Detected %d large moves", len(moves))
+                    clear_query_cache()
+        except Exception as e:
+            logger.error("Collection error: %s", e)
 
-            # Also detect large moves after collection
-            moves = await engine.detect_large_moves()
-            if moves:
-                print(f"[{datetime.utcnow().isoformat()}] Detected {len(moves)} large moves")
+        # Refresh API-backed page data so requests can serve it from memory
+        polymarket = get_polymarket_client()
+        # Refreshed independently so one failing lookup doesn't skip the other
+        try:
+            await refresh_api_movers(polymarket)
+        except Exception as e:
+            logger.error("API movers refresh error: %s", e)
+        try:
+            await refresh_api_black_swans(polymarket, use_cache=False)
         except Exception as e:
-            print(f"[{datetime.utcnow().isoformat()}] Collection error: {e}")
+            logger.error("API black swans refresh error: %s", e)
 
         # Wait for next collection cycle
         await asyncio.sleep(collection_interval)
@@ -60,68 +283,87 @@ async def background_collection():
 
 @app.on_event("startup")
 async def startup():
-    """Initialize database on startup."""
+    """Initialize database, API client and templates on startup."""
     await init_db()
+    await get_polymarket_client().startup()
+
+    # Compile page templates up front so the first request doesn't pay for it
+    for name in PAGE_TEMPLATES:
+        templates.env.get_template(name)
 
     # Start background collection if enabled
-    if os.getenv("ENABLE_BACKGROUND_COLLECTION", "true").lower() == "true":
+    if ENABLE_BACKGROUND_COLLECTION:
         asyncio.create_task(background_collection())
-        print(f"Background data collection enabled (every {settings.collection_interval_hours} hour(s))")
+        logger.info(
+            "Background data collection enabled (every %s hour(s))",
+            settings.collection_interval_hours
+        )
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release API client connections on shutdown."""
+    await get_polymarket_client().close()
+
+
+_background_tasks = set()
+
+
+def _log_background_failure(task: asyncio.Task):
+    """Log the failure of a task that nobody awaits."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background lookup failed", exc_info=task.exception())
 
 
 @app.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request):
+async def dashboard(
+    request: Request,
+    polymarket: PolymarketClient = Depends(get_polymarket_client)
+):
     """Main dashboard page."""
-    overview = await engine.get_overview_stats()
-    markets = await engine.get_active_markets(limit=20)
+    # Black swans are only shown when there are no local ones; the lookup is
+    # started up front so it overlaps the DB queries and warms the snapshot
+    black_swans_task = asyncio.create_task(
+        get_snapshot_black_swans(polymarket, limit=5)
+    )
+    # Hold a reference so the task isn't collected if it outlives the request
+    _background_tasks.add(black_swans_task)
+    black_swans_task.add_done_callback(_background_tasks.discard)
+
+    overview, markets, movers = await asyncio.gather(
+        get_overview_stats(),
+        get_active_markets(limit=20),
+        get_snapshot_movers(polymarket, limit=10),
+        return_exceptions=True
+    )
 
-    # Always fetch movers from API for freshest data
+    for result in (overview, markets):
+        if isinstance(result, Exception):
+            black_swans_task.add_done_callback(_log_background_failure)
+            raise result
+
+    # Movers come from the API snapshot (refreshed in the background)
     # Local movers require multiple snapshots over time
-    movers = []
-    try:
-        print("[Dashboard] Fetching movers from API...")
-        movers = await polymarket_client.get_api_movers(limit=10)
-        print(f"[Dashboard] Got {len(movers)} movers from API")
-    except Exception as e:
-        print(f"[Dashboard] Error fetching movers from API: {e}")
-        import traceback
-        traceback.print_exc()
+    if isinstance(movers, Exception):
+        logger.error("Dashboard: error fetching movers from API", exc_info=movers)
         # Fallback to local data
-        movers = await engine.get_recent_movers(limit=10)
-        print(f"[Dashboard] Fallback: {len(movers)} local movers")
+        movers = await get_recent_movers(limit=10)
+        logger.info("Dashboard: fallback to %d local movers", len(movers))
 
-    # Fetch black swans from API if local count is 0
+    # Use API black swans if local count is 0
     black_swans = []
     if overview.black_swan_count == 0:
         try:
-            print("[Dashboard] Fetching black swans from API...")
-            black_swans = await polymarket_client.find_black_swans_from_api(
-                days_back=60,
-                min_volume=100000,
-                limit=5
-            )
-            print(f"[Dashboard] Got {len(black_swans)} black swans from API")
-        except Exception as e:
-            print(f"[Dashboard] Error fetching black swans from API: {e}")
-            import traceback
-            traceback.print_exc()
-
-    # Convert bucket_stats to serializable dicts for template
-    bucket_stats_json = [
-        {
-            "bucket": b.bucket,
-            "total_resolved": b.total_resolved,
-            "correct_predictions": b.correct_predictions,
-            "accuracy_rate": b.accuracy_rate,
-            "black_swan_count": b.black_swan_count
-        }
-        for b in overview.bucket_stats
-    ]
+            black_swans = await black_swans_task
+        except Exception:
+            logger.exception("Dashboard: error fetching black swans from API")
+    else:
+        black_swans_task.add_done_callback(_log_background_failure)
 
     return templates.TemplateResponse("dashboard.html", {
         "request": request,
         "overview": overview,
-        "bucket_stats_json": bucket_stats_json,
+        "bucket_stats_json": overview.bucket_stats_dict,
         "markets": markets,
         "movers": movers,
         "black_swans": black_swans,
@@ -132,7 +374,7 @@ async def dashboard(request: Request):
 @app.get("/markets", response_class=HTMLResponse)
 async def markets_page(request: Request, sort: str = "volume"):
     """Markets listing page."""
-    markets = await engine.get_active_markets(sort_by=sort, limit=100)
+    markets = await get_active_markets(sort_by=sort, limit=100)
 
     return templates.TemplateResponse("markets.html", {
         "request": request,
@@ -158,14 +400,17 @@ async def market_detail(request: Request, market_id: str):
 
 
 @app.get("/movers", response_class=HTMLResponse)
-async def movers_page(request: Request):
+async def movers_page(
+    request: Request,
+    polymarket: PolymarketClient = Depends(get_polymarket_client)
+):
     """Large movers page."""
-    # Always fetch from API for freshest data
+    # Served from the background-refreshed API snapshot
     try:
-        movers = await polymarket_client.get_api_movers(limit=50)
-    except Exception as e:
-        print(f"Error fetching movers from API: {e}")
-        movers = await engine.get_recent_movers(limit=50)
+        movers = await get_snapshot_movers(polymarket, limit=50)
+    except Exception:
+        logger.exception("Movers page: error fetching movers from API")
+        movers = await get_recent_movers(limit=50)
 
     return templates.TemplateResponse("movers.html", {
         "request": request,
@@ -175,23 +420,23 @@ async def movers_page(request: Request):
 
 
 @app.get("/black-swans", response_class=HTMLResponse)
-async def black_swans_page(request: Request, source: str = "api"):
+async def black_swans_page(
+    request: Request,
+    source: str = "api",
+    polymarket: PolymarketClient = Depends(get_polymarket_client)
+):
     """Black swan events page.
 
     Args:
         source: "local" for tracked markets, "api" for Polymarket API search
     """
     if source == "api":
-        # Fetch from Polymarket API (searches last 60 days)
-        black_swans = await polymarket_client.find_black_swans_from_api(
-            days_back=60,
-            min_volume=100000,
-            limit=50
-        )
+        # Polymarket API search (last 60 days), served from the snapshot
+        black_swans = await get_snapshot_black_swans(polymarket, limit=50)
         source_label = "Polymarket API (last 60 days)"
     else:
         # Fetch from local database
-        black_swans = await engine.get_black_swans(limit=50)
+        black_swans = await get_black_swans(limit=50)
         source_label = "Local tracked markets"
 
     return templates.TemplateResponse("black_swans.html", {
@@ -205,46 +450,37 @@ async def black_swans_page(request: Request, source: str = "api"):
 
 # API endpoints for AJAX/chart updates
 @app.get("/api/overview")
-async def api_overview():
+async def api_overview(request: Request):
     """API endpoint for overview stats."""
-    overview = await engine.get_overview_stats()
-    return {
+    overview = await get_overview_stats()
+    return cacheable_json_response(request, {
         "total_tracked": overview.total_tracked,
         "active_markets": overview.active_markets,
         "resolved_markets": overview.resolved_markets,
         "total_snapshots": overview.total_snapshots,
         "black_swan_count": overview.black_swan_count,
         "recent_large_moves": overview.recent_large_moves,
-        "bucket_stats": [
-            {
-                "bucket": b.bucket,
-                "total_resolved": b.total_resolved,
-                "correct_predictions": b.correct_predictions,
-                "accuracy_rate": b.accuracy_rate,
-                "black_swan_count": b.black_swan_count
-            }
-            for b in overview.bucket_stats
-        ]
-    }
+        "bucket_stats": overview.bucket_stats_dict
+    })
 
 
 @app.get("/api/markets")
-async def api_markets(sort: str = "liquidity", limit: int = 100):
+async def api_markets(request: Request, sort: str = "liquidity", limit: int = 100):
     """API endpoint for markets list."""
-    markets = await engine.get_active_markets(sort_by=sort, limit=limit)
-    return [
+    markets = await get_active_markets(sort_by=sort, limit=limit)
+    return cacheable_json_response(request, [
         {
             "id": m.id,
             "question": m.question,
             "category": m.category,
-            "end_date": m.end_date.isoformat() if m.end_date else None,
+            "end_date": m.end_date,
             "probability": m.probability,
             "liquidity": m.liquidity,
             "volume": m.volume,
             "is_resolved": m.is_resolved
         }
         for m in markets
-    ]
+    ])
 
 
 @app.get("/api/market/{market_id}")
@@ -257,15 +493,40 @@ async def api_market_history(market_id: str):
 
 
 @app.get("/api/movers")
-async def api_movers(limit: int = 20):
+async def api_movers(request: Request, limit: int = 20):
     """API endpoint for recent movers."""
-    return await engine.get_recent_movers(limit=limit)
+    return cacheable_json_response(request, await get_recent_movers(limit=limit))
 
 
 @app.get("/api/black-swans")
-async def api_black_swans(limit: int = 50):
+async def api_black_swans(request: Request, limit: int = 50):
     """API endpoint for black swan events."""
-    return await engine.get_black_swans(limit=limit)
+    return cacheable_json_response(request, await get_black_swans(limit=limit))
+
+
+@app.post("/api/refresh-movers")
+async def api_refresh_movers(
+    secret: str = None,
+    polymarket: PolymarketClient = Depends(get_polymarket_client)
+):
+    """
+    Refresh the API movers snapshot now instead of waiting for the next
+    background collection. Uses the same COLLECT_SECRET check as /api/collect.
+    """
+    if COLLECT_SECRET and secret != COLLECT_SECRET:
+        raise HTTPException(status_code=403, detail="Invalid or missing secret")
+
+    try:
+        movers = await refresh_api_movers(polymarket)
+        return {
+            "status": "success",
+            "movers": len(movers)
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error": str(e)
+        }
 
 
 # Data collection endpoints
@@ -277,16 +538,20 @@ async def api_collect(secret: str = None):
     For security, optionally check a secret token via query param or header.
     Set COLLECT_SECRET environment variable to enable authentication.
     """
-    import os
     from .ingestion import run_ingestion
 
     # Check secret if configured
-    expected_secret = os.getenv("COLLECT_SECRET")
-    if expected_secret and secret != expected_secret:
+    if COLLECT_SECRET and secret != COLLECT_SECRET:
         raise HTTPException(status_code=403, detail="Invalid or missing secret")
 
+    # Don't queue behind a collection that's already running
+    if INGESTION_LOCK.locked():
+        raise HTTPException(status_code=429, detail="Data collection already in progress")
+
     try:
-        stats = await run_ingestion()
+        async with INGESTION_LOCK:
+            stats = await run_ingestion()
+            clear_query_cache()
         return {
             "status": "success",
             "stats": stats
@@ -318,7 +583,8 @@ async def api_simulation_markets(
     date: str,
     min_volume: float = 100000,
     limit: int = 50,
-    any_resolved: bool = False
+    any_resolved: bool = False,
+    polymarket: PolymarketClient = Depends(get_polymarket_client)
 ):
     """
     API endpoint for historical simulation data.
@@ -340,7 +606,7 @@ async def api_simulation_markets(
         raise HTTPException(status_code=400, detail="Cannot simulate future dates")
 
     # Fetch historical data from Polymarket (filter by volume, not liquidity)
-    markets = await polymarket_client.get_historical_simulation_data(
+    markets = await polymarket.get_historical_simulation_data(
         simulation_date=simulation_date,
         min_volume=min_volume,
         limit=limit,
@@ -8,229 +8,405 @@ Analyzes:
 """
 
 import asyncio
+import sqlite3
 import httpx
-import json
+import numpy as np
+import orjson
 from datetime import datetime, timedelta
 from collections import defaultdict
+from dataclasses import dataclass, field
+from operator import itemgetter
+from statistics import fmean
+
+from market_dates import parse_gamma_date
 
 GAMMA_API = "https://gamma-api.polymarket.com"
 CLOB_API = "https://clob.polymarket.com"
 
+# Number of workers fetching price trajectories at the same time
+MARKET_CONCURRENCY = 32
+
+# Check prices at: 30, 25, 20, 15, 10, 7, 5, 3 days before resolution.
+# Also the column order of the trajectory matrix (entry day first).
+CHECK_DAYS = [30, 25, 20, 15, 10, 7, 5, 3]
+
+# Trajectory columns for the exit price (3 days before, else 5, else 7) and
+# the 20-day early warning check; the entry price is column 0
+FINAL_COLS = [CHECK_DAYS.index(d) for d in (3, 5, 7)]
+WARNING_COL = CHECK_DAYS.index(20)
+
+# Half-width of the averaging window and each check day's offset from
+# resolution, in seconds
+WINDOW = int(timedelta(hours=6).total_seconds())
+DAY_OFFSETS = [int(timedelta(days=d).total_seconds()) for d in CHECK_DAYS]
+
+# Window averages from previous runs; delete the file to refetch everything
+TRAJECTORY_CACHE_PATH = "trajectory_cache.db"
+
+
+@dataclass(slots=True)
+class TradeResults:
+    """
+    Analyzed trades stored column-wise, one element per trade in each list.
+
+    Trajectories are arrays in CHECK_DAYS order with NaN for missing days.
+    """
+    questions: list = field(default_factory=list)
+    entries: list = field(default_factory=list)
+    trajectories: list = field(default_factory=list)
+    finals: list = field(default_factory=list)
+    indices: list = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.questions)
+
+    def append(self, question, entry_price, trajectory, final_price, index=0):
+        self.questions.append(question)
+        self.entries.append(entry_price)
+        self.trajectories.append(trajectory)
+        self.finals.append(final_price)
+        self.indices.append(index)
+
+    def sort(self):
+        """Put trades back in market listing order, whatever order they finished in."""
+        order = sorted(range(len(self.indices)), key=self.indices.__getitem__)
+        self.questions = [self.questions[i] for i in order]
+        self.entries = [self.entries[i] for i in order]
+        self.trajectories = [self.trajectories[i] for i in order]
+        self.finals = [self.finals[i] for i in order]
+        self.indices = [self.indices[i] for i in order]
+
+    def to_arrays(self):
+        """
+        Return entry prices (N,), the trajectory matrix (N, len(CHECK_DAYS))
+        and final prices (N,).
+        """
+        entry = np.array(self.entries, dtype=np.float64)
+        final = np.array(self.finals, dtype=np.float64)
+        if self.trajectories:
+            traj = np.vstack(self.trajectories)
+        else:
+            traj = np.empty((0, len(CHECK_DAYS)))
+        return entry, traj, final
+
+
+async def get_average_price(client, cache, token_id, start_ts, end_ts):
+    """
+    Get the average price between two unix timestamps.
+
+    Averages are stored in the trajectory cache, so each window is only
+    fetched from the CLOB API once across runs.
+    """
+    key = (token_id, start_ts, end_ts)
+    row = cache.execute(
+        "SELECT avg_price FROM price_averages WHERE token_id = ? AND start_ts = ? AND end_ts = ?",
+        key
+    ).fetchone()
+    if row is not None:
+        return row[0]
+
+    try:
+        params = {
+            "market": token_id,
+            "startTs": start_ts,
+            "endTs": end_ts,
+            "fidelity": 60
+        }
+        response = await client.get(
+            f"{CLOB_API}/prices-history",
+            params=params,
+            timeout=10.0
+        )
+
+        # Don't cache failed requests, they may succeed on the next run
+        if response.status_code != 200:
+            return None
 
-async def get_price_trajectory(client, market, resolution_date, days_list):
-    """Get prices at multiple points before resolution."""
-    clob_token_ids = market.get("clobTokenIds")
-    if not clob_token_ids:
+        history = orjson.loads(response.content)
+        if isinstance(history, dict) and "history" in history:
+            history = history["history"]
+
+        avg_price = None
+        if history and isinstance(history, list):
+            prices = extract_prices(history)
+            if prices:
+                avg_price = fmean(prices)
+    except:
         return None
 
-    if isinstance(clob_token_ids, str):
+    # Windows without prices are stored as NULL so they aren't refetched either
+    cache.execute("INSERT OR REPLACE INTO price_averages VALUES (?, ?, ?, ?)", (*key, avg_price))
+    return avg_price
+
+
+def _extract_prices_generic(history):
+    """Per-point fallback that tolerates mixed or malformed price points."""
+    prices = []
+    for point in history:
+        if isinstance(point, dict):
+            p = point.get("p") or point.get("price", 0)
+        elif isinstance(point, (list, tuple)) and len(point) >= 2:
+            p = point[1]
+        else:
+            continue
         try:
-            clob_token_ids = json.loads(clob_token_ids)
+            prices.append(float(p))
         except:
+            pass
+    return prices
+
+
+def extract_prices(history):
+    """
+    Pull the prices out of a non-empty prices-history list.
+
+    Every point in a response has the same shape, so the accessor is chosen
+    from the first point; any point that doesn't fit sends the whole list
+    through the generic per-point path.
+    """
+    first = history[0]
+    if isinstance(first, dict):
+        extract = itemgetter("p" if "p" in first else "price")
+    elif isinstance(first, (list, tuple)):
+        extract = itemgetter(1)
+    else:
+        return _extract_prices_generic(history)
+
+    try:
+        return [float(extract(point)) for point in history]
+    except (KeyError, IndexError, TypeError, ValueError):
+        return _extract_prices_generic(history)
+
+
+def open_trajectory_cache(path=TRAJECTORY_CACHE_PATH):
+    """Open (creating if needed) the persistent per-window price average cache."""
+    cache = sqlite3.connect(path)
+    cache.execute(
+        "CREATE TABLE IF NOT EXISTS price_averages ("
+        "token_id TEXT NOT NULL, "
+        "start_ts INTEGER NOT NULL, "
+        "end_ts INTEGER NOT NULL, "
+        "avg_price REAL, "
+        "PRIMARY KEY (token_id, start_ts, end_ts))"
+    )
+    return cache
+
+
+def _decode_json_field(value):
+    """Decode a Gamma field that may arrive as a JSON-encoded string."""
+    if isinstance(value, str):
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
             return None
+    return value
 
-    outcomes = market.get("outcomes", ["Yes", "No"])
-    if isinstance(outcomes, str):
-        try:
-            outcomes = json.loads(outcomes)
-        except:
-            outcomes = ["Yes", "No"]
 
-    # Get winning outcome index
-    prices_raw = market.get("outcomePrices", [])
-    if isinstance(prices_raw, str):
-        try:
-            prices_raw = json.loads(prices_raw)
-        except:
-            prices_raw = []
+def normalize_market(market):
+    """
+    Parse a market's clobTokenIds, outcomes and outcomePrices once.
 
-    winner_idx = None
-    for i, outcome in enumerate(outcomes):
-        if i < len(prices_raw):
+    Returns (clob_token_ids, outcomes, outcome_prices); a field is None if it
+    could not be parsed. Unparseable individual prices become 0.0.
+    """
+    clob_token_ids = _decode_json_field(market.get("clobTokenIds"))
+    outcomes = _decode_json_field(market.get("outcomes", ["Yes", "No"]))
+
+    outcome_prices = _decode_json_field(market.get("outcomePrices", []))
+    if outcome_prices is not None:
+        prices = []
+        for price in outcome_prices:
             try:
-                if float(prices_raw[i]) > 0.95:
-                    winner_idx = i
-                    break
-            except:
-                pass
+                prices.append(float(price))
+            except (TypeError, ValueError):
+                prices.append(0.0)
+        outcome_prices = prices
+
+    return clob_token_ids, outcomes, outcome_prices
+
+
+def parse_trade(market):
+    """
+    Reduce a raw market to what the trajectory analysis needs.
+
+    Returns (token_id, resolution_date, question) for the winning outcome,
+    or None if the market can't be analyzed.
+    """
+    end_date_str = market.get("endDate")
+    if not end_date_str:
+        return None
+
+    resolution_date = parse_gamma_date(end_date_str)
+    if resolution_date is None:
+        return None
+
+    clob_token_ids, outcomes, outcome_prices = normalize_market(market)
+    if not clob_token_ids:
+        return None
+
+    if outcomes is None:
+        outcomes = ["Yes", "No"]
+
+    # Get winning outcome index
+    winner_idx = None
+    for i in range(min(len(outcomes), len(outcome_prices or []))):
+        if outcome_prices[i] > 0.95:
+            winner_idx = i
+            break
 
     if winner_idx is None or winner_idx >= len(clob_token_ids):
         return None
 
-    token_id = clob_token_ids[winner_idx]
+    return clob_token_ids[winner_idx], resolution_date, market.get("question", "")[:50]
 
-    trajectory = {}
 
-    for days in days_list:
-        check_date = resolution_date - timedelta(days=days)
-        start_ts = int((check_date - timedelta(hours=6)).timestamp())
-        end_ts = int((check_date + timedelta(hours=6)).timestamp())
+async def get_price_trajectory(client, cache, token_id, resolution_date):
+    """
+    Get prices at each of CHECK_DAYS before resolution.
 
-        try:
-            params = {
-                "market": token_id,
-                "startTs": start_ts,
-                "endTs": end_ts,
-                "fidelity": 60
-            }
-            response = await client.get(
-                f"{CLOB_API}/prices-history",
-                params=params,
-                timeout=10.0
-            )
+    Returns an array in CHECK_DAYS order with NaN for missing days, or None
+    if fewer than 3 days have prices.
+    """
+    res_ts = int(resolution_date.timestamp())
 
-            if response.status_code == 200:
-                history = response.json()
-                if isinstance(history, dict) and "history" in history:
-                    history = history["history"]
-
-                if history and isinstance(history, list):
-                    prices = []
-                    for point in history:
-                        if isinstance(point, dict):
-                            p = point.get("p") or point.get("price", 0)
-                        elif isinstance(point, (list, tuple)) and len(point) >= 2:
-                            p = point[1]
-                        else:
-                            continue
-                        try:
-                            prices.append(float(p))
-                        except:
-                            pass
-
-                    if prices:
-                        trajectory[days] = sum(prices) / len(prices)
-        except:
-            pass
+    # The per-day lookups are independent, so fetch them concurrently
+    averages = await asyncio.gather(*[
+        get_average_price(client, cache, token_id, res_ts - off - WINDOW, res_ts - off + WINDOW)
+        for off in DAY_OFFSETS
+    ])
 
-    return trajectory if len(trajectory) >= 3 else None
+    trajectory = np.array(
+        [np.nan if avg is None else avg for avg in averages], dtype=np.float64
+    )
 
+    return trajectory if np.count_nonzero(~np.isnan(trajectory)) >= 3 else None
 
-async def analyze_stop_losses():
-    """Analyze different stop-loss strategies."""
 
-    print("Fetching resolved markets...")
-    markets = []
+async def fetch_trades(client, queue, num_workers):
+    """
+    Page through resolved markets and queue each analyzable trade, tagged
+    with the market's position in the listing.
+
+    Raw market dicts are dropped as soon as they're parsed, and workers can
+    start on the first page while later pages are still downloading.
+    """
+    fetched = 0
     offset = 0
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        while len(markets) < 2000:
-            params = {
-                "closed": "true",
-                "limit": 100,
-                "offset": offset,
-                "order": "volumeNum",
-                "ascending": "false"
-            }
+    while fetched < 2000:
+        params = {
+            "closed": "true",
+            "limit": 100,
+            "offset": offset,
+            "order": "volumeNum",
+            "ascending": "false"
+        }
 
-            try:
-                response = await client.get(f"{GAMMA_API}/markets", params=params)
-                response.raise_for_status()
-                data = response.json()
-            except Exception as e:
-                print(f"Error: {e}")
-                break
+        try:
+            response = await client.get(f"{GAMMA_API}/markets", params=params)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+        except Exception as e:
+            print(f"Error: {e}")
+            break
 
-            if not data:
-                break
+        if not data:
+            break
 
-            markets.extend(data)
-            offset += 100
+        for i, market in enumerate(data, start=fetched):
+            trade = parse_trade(market)
+            if trade is not None:
+                await queue.put((i, *trade))
 
-            if len(data) < 100:
-                break
+        fetched += len(data)
+        offset += 100
 
-        print(f"Fetched {len(markets)} markets")
-        print("\nAnalyzing price trajectories...")
+        if len(data) < 100:
+            break
 
-        # Check prices at: 30, 25, 20, 15, 10, 7, 5, 3 days before resolution
-        check_days = [30, 25, 20, 15, 10, 7, 5, 3]
+    print(f"Fetched {fetched} markets")
 
-        results = []
+    # One sentinel per worker signals the end of the stream
+    for _ in range(num_workers):
+        await queue.put(None)
 
-        for idx, market in enumerate(markets):
-            end_date_str = market.get("endDate")
-            if not end_date_str:
-                continue
 
-            try:
-                if 'T' in end_date_str:
-                    resolution_date = datetime.fromisoformat(
-                        end_date_str.replace('Z', '').replace('+00:00', '')
-                    )
-                else:
-                    resolution_date = datetime.strptime(end_date_str, "%Y-%m-%d")
-            except:
-                continue
+async def analyze_trades(client, cache, queue, results):
+    """Worker: fetch trajectories for queued trades and record qualifying ones."""
+    while True:
+        trade = await queue.get()
+        if trade is None:
+            return
 
-            trajectory = await get_price_trajectory(client, market, resolution_date, check_days)
-            if not trajectory or 30 not in trajectory:
-                continue
+        index, token_id, resolution_date, question = trade
+        trajectory = await get_price_trajectory(client, cache, token_id, resolution_date)
+        if trajectory is None or np.isnan(trajectory[0]):
+            continue
 
-            entry_price = trajectory[30]
+        entry_price = trajectory[0]
 
-            # Only analyze 85-95% entries
-            if entry_price < 0.85 or entry_price > 0.95:
-                continue
+        # Only analyze 85-95% entries
+        if entry_price < 0.85 or entry_price > 0.95:
+            continue
 
-            # Determine if this was ultimately a winner or loser
-            final_price = trajectory.get(3, trajectory.get(5, trajectory.get(7)))
-            if final_price is None:
-                continue
+        # Exit at the latest available price
+        final_prices = trajectory[FINAL_COLS]
+        final_prices = final_prices[~np.isnan(final_prices)]
+        if not final_prices.size:
+            continue
 
-            profit_pct = (final_price - entry_price) / entry_price * 100
-            is_winner = profit_pct > 0
+        results.append(question, entry_price, trajectory, final_prices[0], index)
 
-            results.append({
-                "question": market.get("question", "")[:50],
-                "entry_price": entry_price,
-                "trajectory": trajectory,
-                "final_price": final_price,
-                "profit_pct": profit_pct,
-                "is_winner": is_winner
-            })
+        if len(results) % 30 == 0:
+            print(f"Analyzed {len(results)} trades...")
 
-            if len(results) % 30 == 0:
-                print(f"Analyzed {len(results)} trades...")
 
-    return results
+async def analyze_stop_losses():
+    """Analyze different stop-loss strategies."""
 
+    print("Fetching resolved markets and analyzing price trajectories...")
+    results = TradeResults()
 
-def simulate_stop_loss(results, stop_loss_pct):
-    """Simulate strategy with a specific stop-loss percentage."""
-    trades = []
+    # Bounded so pagination doesn't run far ahead of the workers
+    queue = asyncio.Queue(maxsize=MARKET_CONCURRENCY * 4)
 
-    for r in results:
-        entry = r["entry_price"]
-        stop_price = entry * (1 - stop_loss_pct / 100)
+    # Nearly every request goes to the CLOB host, so multiplex them over
+    # HTTP/2 and size the pool to the worker count
+    limits = httpx.Limits(max_connections=64, max_keepalive_connections=64)
 
-        # Check if stop-loss would have been triggered
-        stopped_out = False
-        exit_price = r["final_price"]
+    cache = open_trajectory_cache()
+    try:
+        async with httpx.AsyncClient(timeout=30.0, http2=True, limits=limits) as client:
+            await asyncio.gather(
+                fetch_trades(client, queue, MARKET_CONCURRENCY),
+                *[analyze_trades(client, cache, queue, results) for _ in range(MARKET_CONCURRENCY)]
+            )
+    finally:
+        cache.commit()
+        cache.close()
 
-        trajectory = r["trajectory"]
-        check_days = sorted(trajectory.keys(), reverse=True)  # 30, 25, 20, ...
+    # Workers finish in any order; report in listing order
+    results.sort()
+    return results
 
-        for day in check_days:
-            if day == 30:  # Entry day
-                continue
-            price = trajectory[day]
-            if price <= stop_price:
-                stopped_out = True
-                exit_price = stop_price  # Assume we exit at stop price
-                break
 
-        actual_profit = (exit_price - entry) / entry * 100
+def simulate_stop_loss(entry, traj, final, stop_loss_pct):
+    """
+    Simulate strategy with a specific stop-loss percentage.
 
-        trades.append({
-            "entry": entry,
-            "exit": exit_price,
-            "profit_pct": actual_profit,
-            "stopped_out": stopped_out,
-            "original_outcome": "win" if r["is_winner"] else "loss"
-        })
+    Returns (profit_pct, stopped_out) arrays, one element per trade.
+    """
+    stop_price = entry * (1 - stop_loss_pct / 100)
 
-    return trades
+    # Stopped out if any price after the entry day (column 0) hit the stop;
+    # missing days are NaN and never compare as <=
+    stopped_out = (traj[:, 1:] <= stop_price[:, None]).any(axis=1)
+
+    # Assume we exit at stop price
+    exit_price = np.where(stopped_out, stop_price, final)
+    profit_pct = (exit_price - entry) / entry * 100
+
+    return profit_pct, stopped_out
 
 
 def print_analysis(results):
@@ -241,21 +417,27 @@ def print_analysis(results):
     print(f"\nTotal trades analyzed: {len(results)}")
 
     # Baseline: No stop-loss
-    winners = [r for r in results if r["is_winner"]]
-    losers = [r for r in results if not r["is_winner"]]
+    entry, traj, final = results.to_arrays()
+    baseline_profit = (final - entry) / entry * 100
+    is_winner = baseline_profit > 0
+    cnt = baseline_profit.size
+    n_winners = int(is_winner.sum())
+    n_losers = cnt - n_winners
+    loser_idx = np.flatnonzero(~is_winner)
 
     print(f"\nBASELINE (No Stop-Loss):")
-    print(f"  Winners: {len(winners)} ({len(winners)/len(results)*100:.1f}%)")
-    print(f"  Losers: {len(losers)} ({len(losers)/len(results)*100:.1f}%)")
+    print(f"  Winners: {n_winners} ({n_winners/cnt*100:.1f}%)")
+    print(f"  Losers: {n_losers} ({n_losers/cnt*100:.1f}%)")
 
-    total_return = sum(r["profit_pct"] for r in results)
-    avg_return = total_return / len(results)
+    total_return = baseline_profit.sum()
+    avg_return = total_return / cnt
     print(f"  Average return: {avg_return:.2f}%")
     print(f"  Total return (sum): {total_return:.1f}%")
 
-    if losers:
-        avg_loss = sum(r["profit_pct"] for r in losers) / len(losers)
-        worst_loss = min(r["profit_pct"] for r in losers)
+    if n_losers:
+        loser_profit = baseline_profit[loser_idx]
+        avg_loss = loser_profit.sum() / n_losers
+        worst_loss = loser_profit.min()
         print(f"  Average loss: {avg_loss:.2f}%")
         print(f"  Worst loss: {worst_loss:.2f}%")
 
@@ -271,18 +453,19 @@ def print_analysis(results):
     for sl in stop_loss_levels:
         if sl is None:
             # No stop loss
-            trades = [{"profit_pct": r["profit_pct"], "stopped_out": False} for r in results]
+            profit = baseline_profit
+            stopped_out = np.zeros(len(results), dtype=bool)
             sl_label = "None"
         else:
-            trades = simulate_stop_loss(results, sl)
+            profit, stopped_out = simulate_stop_loss(entry, traj, final, sl)
             sl_label = f"{sl}%"
 
-        stopped = sum(1 for t in trades if t["stopped_out"])
-        wins = sum(1 for t in trades if t["profit_pct"] > 0)
-        losses = sum(1 for t in trades if t["profit_pct"] <= 0)
-        avg_ret = sum(t["profit_pct"] for t in trades) / len(trades)
-        total_ret = sum(t["profit_pct"] for t in trades)
-        max_loss = min(t["profit_pct"] for t in trades)
+        stopped = int(stopped_out.sum())
+        wins = int((profit > 0).sum())
+        losses = int((profit <= 0).sum())
+        avg_ret = profit.mean()
+        total_ret = profit.sum()
+        max_loss = profit.min()
 
         print(f"{sl_label:<12} {stopped:<10} {wins:<10} {losses:<10} {avg_ret:<10.2f}%  {total_ret:<10.1f}%  {max_loss:.1f}%")
 
@@ -293,18 +476,17 @@ def print_analysis(results):
     print("LOSING TRADE TRAJECTORIES (How fast do they drop?)")
     print("-" * 80)
 
-    for r in sorted(losers, key=lambda x: x["profit_pct"])[:10]:
-        trajectory = r["trajectory"]
-        entry = r["entry_price"]
+    worst_idx = loser_idx[np.argsort(baseline_profit[loser_idx], kind="stable")[:10]]
+    for i in worst_idx:
+        entry_price = entry[i]
 
-        print(f"\n{r['question']}...")
-        print(f"  Entry (30d): {entry*100:.1f}%")
+        print(f"\n{results.questions[i]}...")
+        print(f"  Entry (30d): {entry_price*100:.1f}%")
 
-        for day in sorted(trajectory.keys(), reverse=True):
-            if day == 30:
+        for day, price in zip(CHECK_DAYS[1:], traj[i, 1:]):
+            if np.isnan(price):
                 continue
-            price = trajectory[day]
-            change = (price - entry) / entry * 100
+            change = (price - entry_price) / entry_price * 100
             marker = " *** WARNING ***" if change < -5 else ""
             print(f"  {day:2d}d before:  {price*100:.1f}% ({change:+.1f}%){marker}")
 
@@ -314,19 +496,12 @@ def print_analysis(results):
     print("-" * 80)
 
     # Check if losing trades showed warning signs at 20d or 15d
-    early_warnings = 0
-    for r in losers:
-        trajectory = r["trajectory"]
-        entry = r["entry_price"]
-
-        # Check 20 days before
-        if 20 in trajectory:
-            drop_at_20d = (trajectory[20] - entry) / entry * 100
-            if drop_at_20d < -3:
-                early_warnings += 1
-
-    if losers:
-        print(f"  Losing trades with >3% drop at 20 days: {early_warnings}/{len(losers)} ({early_warnings/len(losers)*100:.0f}%)")
+    # Missing 20-day prices are NaN and never count as a drop
+    drop_at_20d = (traj[loser_idx, WARNING_COL] - entry[loser_idx]) / entry[loser_idx] * 100
+    early_warnings = int((drop_at_20d < -3).sum())
+
+    if n_losers:
+        print(f"  Losing trades with >3% drop at 20 days: {early_warnings}/{n_losers} ({early_warnings/n_losers*100:.0f}%)")
 
     print("""
 RECOMMENDATIONS:
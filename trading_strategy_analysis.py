@@ -4,31 +4,205 @@ sell before resolution. No fees on trades.
 """
 
 import asyncio
+import contextlib
+import heapq
+import random
 import httpx
-import json
+import numpy as np
+import orjson
 from datetime import datetime, timedelta
 from collections import defaultdict
+from dataclasses import dataclass, field
+
+from market_dates import parse_gamma_date
 
 GAMMA_API = "https://gamma-api.polymarket.com"
 CLOB_API = "https://clob.polymarket.com"
 
+# Gamma pagination: up to MAX_MARKETS resolved markets, PAGE_SIZE per request
+MAX_MARKETS = 2000
+PAGE_SIZE = 100
+
+# CLOB requests in flight at the same time. They all go to one host and are
+# multiplexed over HTTP/2, so this caps the streams we open against it.
+# Gamma requests aren't counted, so discovery never waits behind price lookups.
+CLOB_CONCURRENCY = 50
+_clob_sem = asyncio.Semaphore(CLOB_CONCURRENCY)
+
+# Retries for transient failures (connection errors, 429 and 5xx responses)
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.2
+RETRY_MAX_DELAY = 30.0
+
+# Offsets from resolution in seconds: the entry and exit days, and the
+# half-width of the window averaged around each day
+ENTRY_OFFSET = int(timedelta(days=30).total_seconds())
+EXIT_OFFSET = int(timedelta(days=3).total_seconds())
+PRICE_HALF_WIDTH = int(timedelta(hours=12).total_seconds())
+
+# Both days are read from one series spanning them. If CLOB rejects that
+# interval (HTTP 400), every later market falls back to a 1-day window per day.
+WINDOW_REJECTED = object()
+_wide_window_ok = True
+
+# Price series per (token_id, start_ts, end_ts) window; None means the
+# window had no prices. Persisted between runs as JSON lines in
+# PRICE_CACHE_PATH: new entries are appended in batches from a worker
+# thread, so cache writes never stall the event loop or rewrite the file.
+PRICE_CACHE_PATH = "price_cache.jsonl"
+PRICE_CACHE_FLUSH_LINES = 200
+_price_cache = {}
+_price_cache_pending = []
+_price_cache_write_lock = asyncio.Lock()
+
+
+@dataclass(slots=True)
+class MarketCtx:
+    """What the price lookups need from a market, resolved once from Gamma."""
+    token_id: str
+    resolution_ts: int
+    question: str
+    # Position in the Gamma listing, so results can be put back in that order
+    index: int = 0
+
+
+@dataclass(slots=True)
+class TradeResults:
+    """Tradeable markets stored column-wise, one element per trade in each list."""
+    questions: list = field(default_factory=list)
+    price_30d: list = field(default_factory=list)
+    price_3d: list = field(default_factory=list)
+    indices: list = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.questions)
+
+    def append(self, question, price_30d, price_3d, index=0):
+        self.questions.append(question)
+        self.price_30d.append(price_30d)
+        self.price_3d.append(price_3d)
+        self.indices.append(index)
+
+    def sort(self):
+        """Put trades back in market listing order, whatever order they finished in."""
+        order = sorted(range(len(self.indices)), key=self.indices.__getitem__)
+        self.questions = [self.questions[i] for i in order]
+        self.price_30d = [self.price_30d[i] for i in order]
+        self.price_3d = [self.price_3d[i] for i in order]
+        self.indices = [self.indices[i] for i in order]
+
+    def to_dicts(self):
+        """One dict per trade, in the layout of the saved results file."""
+        return [
+            {
+                "question": question,
+                "price_30d": p30,
+                "price_3d": p3,
+                "profit_pct": (p3 - p30) / p30 * 100,
+                "absolute_profit": p3 - p30
+            }
+            for question, p30, p3 in zip(self.questions, self.price_30d, self.price_3d)
+        ]
+
+
+def load_price_cache(path=PRICE_CACHE_PATH):
+    """Load price series saved by previous runs, if any."""
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    token_id, start_ts, end_ts, series = orjson.loads(line)
+                except (TypeError, ValueError):
+                    # e.g. a line cut short by an interrupted run
+                    continue
+                _price_cache[(token_id, start_ts, end_ts)] = series
+    except OSError:
+        return
+
+
+def _append_to_file(path, data):
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+async def flush_price_cache(path=PRICE_CACHE_PATH):
+    """Append series fetched since the last flush to the cache file."""
+    async with _price_cache_write_lock:
+        if not _price_cache_pending:
+            return
+
+        lines = _price_cache_pending[:]
+        _price_cache_pending.clear()
+        try:
+            await asyncio.to_thread(_append_to_file, path, b"".join(lines))
+        except OSError as e:
+            # Keep the lines (ahead of any added meanwhile) for the next flush
+            _price_cache_pending[:0] = lines
+            print(f"Error writing price cache: {e}")
+
+
+def _winner_index(outcomes, prices_raw):
+    """Index of the first outcome priced above 0.95, or None."""
+    if len(outcomes) == 2 and len(prices_raw) >= 2:
+        # Binary markets (nearly all of them): compare both prices directly
+        try:
+            if float(prices_raw[0]) > 0.95:
+                return 0
+            if float(prices_raw[1]) > 0.95:
+                return 1
+            return None
+        except (TypeError, ValueError):
+            pass
+
+    # Multi-outcome markets, or a price that didn't parse
+    for i in range(min(len(outcomes), len(prices_raw))):
+        try:
+            if float(prices_raw[i]) > 0.95:
+                return i
+        except (TypeError, ValueError):
+            pass
+
+    return None
+
+
+def qualifies(market, index=0):
+    """
+    Parse the dates and find the winning token without any HTTP calls.
+
+    Returns a MarketCtx for the winning token, or None if the market has no end
+    date, ran for less than the entry offset, has no token ids or has no clear
+    winner.
+    """
+    end_date_str = market.get("endDate")
+    if not end_date_str:
+        return None
+
+    resolution_date = parse_gamma_date(end_date_str)
+    if resolution_date is None:
+        return None
+
+    # A market opened less than 30 days before resolution has no entry price
+    start_date_str = market.get("startDate") or market.get("createdAt")
+    if start_date_str:
+        start_date = parse_gamma_date(start_date_str)
+        if (start_date is not None
+                and (resolution_date - start_date).total_seconds() < ENTRY_OFFSET):
+            return None
 
-async def get_price_at_days_before(client, market, resolution_date, days_before):
-    """Get price at specific days before resolution."""
     clob_token_ids = market.get("clobTokenIds")
     if not clob_token_ids:
         return None
 
     if isinstance(clob_token_ids, str):
         try:
-            clob_token_ids = json.loads(clob_token_ids)
+            clob_token_ids = orjson.loads(clob_token_ids)
         except:
             return None
 
     outcomes = market.get("outcomes", ["Yes", "No"])
     if isinstance(outcomes, str):
         try:
-            outcomes = json.loads(outcomes)
+            outcomes = orjson.loads(outcomes)
         except:
             outcomes = ["Yes", "No"]
 
@@ -36,90 +210,220 @@ async def get_price_at_days_before(client, market, resolution_date, days_before)
     prices_raw = market.get("outcomePrices", [])
     if isinstance(prices_raw, str):
         try:
-            prices_raw = json.loads(prices_raw)
+            prices_raw = orjson.loads(prices_raw)
         except:
             prices_raw = []
 
-    winner_idx = None
-    for i, outcome in enumerate(outcomes):
-        if i < len(prices_raw):
+    winner_idx = _winner_index(outcomes, prices_raw)
+    if winner_idx is None or winner_idx >= len(clob_token_ids):
+        return None
+
+    return MarketCtx(
+        token_id=clob_token_ids[winner_idx],
+        resolution_ts=int(resolution_date.timestamp()),
+        question=market.get("question", ""),
+        index=index
+    )
+
+
+def _retry_delay(attempt, response=None):
+    """Seconds to wait before the next attempt, honouring Retry-After if given."""
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
             try:
-                if float(prices_raw[i]) > 0.95:
-                    winner_idx = i
-                    break
-            except:
+                return min(float(retry_after), RETRY_MAX_DELAY)
+            except ValueError:
                 pass
+    return RETRY_BASE_DELAY * 2 ** attempt + random.random() * 0.1
 
-    if winner_idx is None or winner_idx >= len(clob_token_ids):
-        return None
 
-    token_id = clob_token_ids[winner_idx]
+async def fetch_json(client, url, params, *, attempts=RETRY_ATTEMPTS, **kwargs):
+    """
+    GET a URL and decode its JSON body, retrying transient failures.
 
-    check_date = resolution_date - timedelta(days=days_before)
-    start_ts = int((check_date - timedelta(hours=12)).timestamp())
-    end_ts = int((check_date + timedelta(hours=12)).timestamp())
+    Connection errors and 429/5xx responses are retried with exponential
+    backoff and jitter. Other HTTP errors, and the last failed attempt, raise.
+    """
+    # Only the slot is held during the request, not during the backoff sleep
+    limit = _clob_sem if url.startswith(CLOB_API) else contextlib.nullcontext()
 
+    for attempt in range(attempts):
+        try:
+            async with limit:
+                response = await client.get(url, params=params, **kwargs)
+            response.raise_for_status()
+            return orjson.loads(response.content)
+        except httpx.TransportError:
+            if attempt == attempts - 1:
+                raise
+            delay = _retry_delay(attempt)
+        except httpx.HTTPStatusError as e:
+            status = e.response.status_code
+            if attempt == attempts - 1 or (status != 429 and status < 500):
+                raise
+            delay = _retry_delay(attempt, e.response)
+
+        await asyncio.sleep(delay)
+
+
+async def fetch_window(client, ctx, start_ts, end_ts, wide=False):
+    """
+    Get the market's winning-token price series between two unix timestamps.
+
+    Returns a list of (timestamp, price) pairs, or None if there are no prices.
+    For a wide window, returns WINDOW_REJECTED if CLOB refuses the interval.
+    """
+    global _wide_window_ok
+    token_id = ctx.token_id
+    key = (token_id, start_ts, end_ts)
+    if key in _price_cache:
+        return _price_cache[key]
+
+    params = {
+        "market": token_id,
+        "startTs": start_ts,
+        "endTs": end_ts,
+        "fidelity": 60
+    }
     try:
-        params = {
-            "market": token_id,
-            "startTs": start_ts,
-            "endTs": end_ts,
-            "fidelity": 60
-        }
-        response = await client.get(
-            f"{CLOB_API}/prices-history",
-            params=params,
-            timeout=10.0
+        history = await fetch_json(client, f"{CLOB_API}/prices-history", params, timeout=10.0)
+    except httpx.HTTPStatusError as e:
+        if wide and e.response.status_code == 400:
+            if _wide_window_ok:
+                _wide_window_ok = False
+                print("Wide price history window rejected, using 1-day windows")
+            return WINDOW_REJECTED
+        # Don't cache failed requests, they may succeed on the next run
+        print(f"Error fetching prices for {token_id}: {e}")
+        return None
+    except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+        print(f"Error fetching prices for {token_id}: {e}")
+        return None
+
+    if isinstance(history, dict) and "history" in history:
+        history = history["history"]
+
+    series = None
+    if history and isinstance(history, list):
+        points = []
+        for point in history:
+            if isinstance(point, dict):
+                t = point.get("t")
+                p = point.get("p") or point.get("price", 0)
+            elif isinstance(point, (list, tuple)) and len(point) >= 2:
+                t, p = point[0], point[1]
+            else:
+                continue
+            try:
+                points.append((int(t), float(p)))
+            except (TypeError, ValueError):
+                pass
+
+        if points:
+            series = points
+
+    _price_cache[key] = series
+    _price_cache_pending.append(orjson.dumps([token_id, start_ts, end_ts, series]) + b"\n")
+    if len(_price_cache_pending) >= PRICE_CACHE_FLUSH_LINES:
+        await flush_price_cache()
+
+    return series
+
+
+def price_at(series, target_ts, half_width=PRICE_HALF_WIDTH):
+    """Average price of the points within half_width seconds of target_ts."""
+    lo = target_ts - half_width
+    hi = target_ts + half_width
+
+    # Running sum and count, so no list of prices is built per lookup
+    total = 0.0
+    n = 0
+    for t, p in series:
+        if lo <= t <= hi:
+            total += p
+            n += 1
+
+    return total / n if n else None
+
+
+async def process_market(ctx, client):
+    """
+    Read a market's entry (30 days before) and exit (3 days before) prices.
+
+    Each price is the average over a one-day window around its day. Both are
+    read from one series spanning the two windows, so each market needs a
+    single prices-history request; if CLOB rejects that interval, each window
+    is fetched on its own, the exit one only when the entry price is in
+    range. Returns (question, price_30d, price_3d), or None if the market
+    isn't tradeable.
+    """
+    resolution_ts = ctx.resolution_ts
+    entry_ts = resolution_ts - ENTRY_OFFSET
+    exit_ts = resolution_ts - EXIT_OFFSET
+
+    series = WINDOW_REJECTED
+    if _wide_window_ok:
+        series = await fetch_window(
+            client, ctx, entry_ts - PRICE_HALF_WIDTH, exit_ts + PRICE_HALF_WIDTH, wide=True
+        )
+    narrow = series is WINDOW_REJECTED
+    if narrow:
+        series = await fetch_window(
+            client, ctx, entry_ts - PRICE_HALF_WIDTH, entry_ts + PRICE_HALF_WIDTH
         )
 
-        if response.status_code == 200:
-            history = response.json()
-            if isinstance(history, dict) and "history" in history:
-                history = history["history"]
-
-            if history and isinstance(history, list):
-                prices = []
-                for point in history:
-                    if isinstance(point, dict):
-                        p = point.get("p") or point.get("price", 0)
-                    elif isinstance(point, (list, tuple)) and len(point) >= 2:
-                        p = point[1]
-                    else:
-                        continue
-                    try:
-                        prices.append(float(p))
-                    except:
-                        pass
-
-                if prices:
-                    return sum(prices) / len(prices)
-    except:
-        pass
+    # Get price 30 days before
+    price_30d = price_at(series, entry_ts) if series else None
+    if price_30d is None:
+        return None
 
-    return None
+    # Only interested in high-confidence outcomes (85-98%)
+    if price_30d < 0.85 or price_30d > 0.98:
+        return None
 
+    # Get price 3 days before (our sell point)
+    if narrow:
+        series = await fetch_window(
+            client, ctx, exit_ts - PRICE_HALF_WIDTH, exit_ts + PRICE_HALF_WIDTH
+        )
+    price_3d = price_at(series, exit_ts) if series else None
+    if price_3d is None:
+        return None
 
-async def analyze_trading_strategy():
-    """Analyze buy-at-30-days, sell-at-3-days strategy."""
+    return ctx.question, price_30d, price_3d
 
-    print("Fetching resolved markets...")
-    markets = []
-    offset = 0
-
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        while len(markets) < 2000:
-            params = {
-                "closed": "true",
-                "limit": 100,
-                "offset": offset,
-                "order": "volumeNum",
-                "ascending": "false"
-            }
 
+async def fetch_markets_page(client, offset):
+    """Fetch one page of resolved markets, ordered by volume."""
+    params = {
+        "closed": "true",
+        "limit": PAGE_SIZE,
+        "offset": offset,
+        "order": "volumeNum",
+        "ascending": "false"
+    }
+    return await fetch_json(client, f"{GAMMA_API}/markets", params)
+
+
+async def produce_markets(client, queue, num_workers):
+    """
+    Fetch all pages of resolved markets at once and queue qualifying markets.
+
+    Pages are consumed in offset order as they arrive, so workers start on
+    the first page while later ones are still downloading. Paging stops at
+    the first failed, empty or short page, like the sequential loop did.
+    """
+    pages = [
+        asyncio.create_task(fetch_markets_page(client, offset))
+        for offset in range(0, MAX_MARKETS, PAGE_SIZE)
+    ]
+    fetched = 0
+
+    try:
+        for page in pages:
             try:
-                response = await client.get(f"{GAMMA_API}/markets", params=params)
-                response.raise_for_status()
-                data = response.json()
+                data = await page
             except Exception as e:
                 print(f"Error: {e}")
                 break
@@ -127,64 +431,96 @@ async def analyze_trading_strategy():
             if not data:
                 break
 
-            markets.extend(data)
-            offset += 100
+            # Drop markets that can never qualify before spending a request on them
+            for i, market in enumerate(data, start=fetched):
+                ctx = qualifies(market, i)
+                if ctx is not None:
+                    await queue.put(ctx)
+
+            fetched += len(data)
 
-            if len(data) < 100:
+            if len(data) < PAGE_SIZE:
                 break
+    finally:
+        # Pages past the stopping point aren't needed
+        for page in pages:
+            page.cancel()
+        await asyncio.gather(*pages, return_exceptions=True)
 
-        print(f"Fetched {len(markets)} markets")
-        print("\nAnalyzing trading opportunities...")
+        # One sentinel per worker signals the end of the stream
+        for _ in range(num_workers):
+            await queue.put(None)
 
-        results = []
-        batch_size = 15
+    print(f"Fetched {fetched} markets")
 
-        for i in range(0, len(markets), batch_size):
-            batch = markets[i:i + batch_size]
 
-            for market in batch:
-                end_date_str = market.get("endDate")
-                if not end_date_str:
-                    continue
+async def consume_markets(client, queue, results):
+    """Worker: read prices for queued markets and record the tradeable ones."""
+    while True:
+        ctx = await queue.get()
+        if ctx is None:
+            return
 
-                try:
-                    if 'T' in end_date_str:
-                        resolution_date = datetime.fromisoformat(
-                            end_date_str.replace('Z', '').replace('+00:00', '')
-                        )
-                    else:
-                        resolution_date = datetime.strptime(end_date_str, "%Y-%m-%d")
-                except:
-                    continue
+        try:
+            trade = await process_market(ctx, client)
+        except Exception as e:
+            # One bad market shouldn't stop the worker, but don't hide it
+            print(f"Error processing market {ctx.question!r}: {e!r}")
+            continue
 
-                # Get price 30 days before
-                price_30d = await get_price_at_days_before(client, market, resolution_date, 30)
-                if price_30d is None:
-                    continue
+        if trade is not None:
+            results.append(*trade, ctx.index)
 
-                # Only interested in high-confidence outcomes (85-98%)
-                if price_30d < 0.85 or price_30d > 0.98:
-                    continue
 
-                # Get price 3 days before (our sell point)
-                price_3d = await get_price_at_days_before(client, market, resolution_date, 3)
-                if price_3d is None:
-                    continue
+async def analyze_trading_strategy():
+    """Analyze buy-at-30-days, sell-at-3-days strategy."""
 
-                results.append({
-                    "question": market.get("question", "")[:60],
-                    "price_30d": price_30d,
-                    "price_3d": price_3d,
-                    "profit_pct": (price_3d - price_30d) / price_30d * 100,
-                    "absolute_profit": price_3d - price_30d
-                })
+    print("Fetching resolved markets and analyzing trading opportunities...")
+    results = TradeResults()
+
+    # Bounded so discovery doesn't run far ahead of the workers
+    queue = asyncio.Queue(maxsize=CLOB_CONCURRENCY * 4)
+
+    # Size the pool to the lookup concurrency and multiplex the CLOB
+    # requests over HTTP/2 instead of the default 20-connection pool
+    limits = httpx.Limits(
+        max_connections=100,
+        max_keepalive_connections=CLOB_CONCURRENCY,
+        keepalive_expiry=60
+    )
+
+    async with httpx.AsyncClient(timeout=30.0, http2=True, limits=limits) as client:
+        # Price lookups start as soon as the first page of markets arrives;
+        # fetch_json caps how many CLOB requests are actually in flight
+        await asyncio.gather(
+            produce_markets(client, queue, CLOB_CONCURRENCY),
+            *[consume_markets(client, queue, results) for _ in range(CLOB_CONCURRENCY)]
+        )
 
-            if len(results) % 50 == 0 and len(results) > 0:
-                print(f"Found {len(results)} tradeable markets...")
+    # Workers finish in any order; report and save in listing order
+    results.sort()
+    print(f"Found {len(results)} tradeable markets")
 
     return results
 
 
+def _win_loss_stats(profits, is_win):
+    """
+    Win rate (%), average win and average loss for a set of trades.
+
+    Takes the win/loss partition precomputed for all trades; an average is
+    None when there are no trades on that side.
+    """
+    n_wins = int(is_win.sum())
+    n_losses = profits.size - n_wins
+
+    win_rate = n_wins / profits.size * 100
+    avg_win = profits.sum(where=is_win) / n_wins if n_wins else None
+    avg_loss = profits.sum(where=~is_win) / n_losses if n_losses else None
+
+    return win_rate, avg_win, avg_loss
+
+
 def print_results(results):
     print("\n" + "=" * 80)
     print("TRADING STRATEGY ANALYSIS: Buy at 30 days, Sell at 3 days before resolution")
@@ -194,11 +530,18 @@ def print_results(results):
         print("No results found")
         return
 
+    p30 = np.array(results.price_30d, dtype=np.float64)
+    p3 = np.array(results.price_3d, dtype=np.float64)
+    profits = (p3 - p30) / p30 * 100
+
+    # Partition wins and losses once for the bucket and overall stats
+    is_win = profits > 0
+
     # Filter by entry price buckets
     buckets = {
-        "85-90%": [r for r in results if 0.85 <= r["price_30d"] < 0.90],
-        "90-95%": [r for r in results if 0.90 <= r["price_30d"] < 0.95],
-        "95-98%": [r for r in results if 0.95 <= r["price_30d"] <= 0.98],
+        "85-90%": (p30 >= 0.85) & (p30 < 0.90),
+        "90-95%": (p30 >= 0.90) & (p30 < 0.95),
+        "95-98%": (p30 >= 0.95) & (p30 <= 0.98),
     }
 
     print(f"\nTotal tradeable markets found: {len(results)}")
@@ -209,42 +552,42 @@ def print_results(results):
     print(f"{'Entry Price':<12} {'Count':<8} {'Avg Profit':<12} {'Win Rate':<10} {'Avg Win':<10} {'Avg Loss':<10}")
     print("-" * 80)
 
-    for bucket_name, bucket_results in buckets.items():
-        if not bucket_results:
+    for bucket_name, mask in buckets.items():
+        bucket_profits = profits[mask]
+        count = bucket_profits.size
+        if not count:
             continue
 
-        profits = [r["profit_pct"] for r in bucket_results]
-        wins = [p for p in profits if p > 0]
-        losses = [p for p in profits if p <= 0]
+        avg_profit = bucket_profits.mean()
+        win_rate, avg_win, avg_loss = _win_loss_stats(bucket_profits, is_win[mask])
+        avg_win = avg_win or 0
+        avg_loss = avg_loss or 0
 
-        avg_profit = sum(profits) / len(profits)
-        win_rate = len(wins) / len(profits) * 100
-        avg_win = sum(wins) / len(wins) if wins else 0
-        avg_loss = sum(losses) / len(losses) if losses else 0
-
-        print(f"{bucket_name:<12} {len(bucket_results):<8} {avg_profit:<10.2f}%  {win_rate:<8.1f}%  {avg_win:<8.2f}%  {avg_loss:<8.2f}%")
+        print(f"{bucket_name:<12} {count:<8} {avg_profit:<10.2f}%  {win_rate:<8.1f}%  {avg_win:<8.2f}%  {avg_loss:<8.2f}%")
 
     print("-" * 80)
 
     # Overall stats
-    all_profits = [r["profit_pct"] for r in results]
-    wins = [r for r in results if r["profit_pct"] > 0]
-    losses = [r for r in results if r["profit_pct"] <= 0]
+    win_rate, avg_win, avg_loss = _win_loss_stats(profits, is_win)
+
+    # Upper median (element n//2 in sorted order), without a full sort
+    mid = profits.size // 2
+    median_profit = np.partition(profits, mid)[mid]
 
     print(f"\nOVERALL STATISTICS:")
     print(f"  Total trades: {len(results)}")
-    print(f"  Win rate: {len(wins)/len(results)*100:.1f}%")
-    print(f"  Average profit per trade: {sum(all_profits)/len(all_profits):.2f}%")
-    print(f"  Median profit: {sorted(all_profits)[len(all_profits)//2]:.2f}%")
+    print(f"  Win rate: {win_rate:.1f}%")
+    print(f"  Average profit per trade: {profits.mean():.2f}%")
+    print(f"  Median profit: {median_profit:.2f}%")
 
-    if wins:
-        print(f"  Average winning trade: +{sum(r['profit_pct'] for r in wins)/len(wins):.2f}%")
-    if losses:
-        print(f"  Average losing trade: {sum(r['profit_pct'] for r in losses)/len(losses):.2f}%")
+    if avg_win is not None:
+        print(f"  Average winning trade: +{avg_win:.2f}%")
+    if avg_loss is not None:
+        print(f"  Average losing trade: {avg_loss:.2f}%")
 
     # Simulate $1000 across all trades equally
     capital_per_trade = 1000 / len(results)
-    total_return = sum(capital_per_trade * (1 + r["profit_pct"]/100) for r in results)
+    total_return = capital_per_trade * (1 + profits / 100).sum()
 
     print(f"\n  Simulated return on $1000 spread equally: ${total_return:.2f} ({(total_return/1000-1)*100:.1f}%)")
 
@@ -253,28 +596,40 @@ def print_results(results):
     print("WORST LOSSES (when high-confidence prediction flipped)")
     print("-" * 80)
 
-    worst = sorted(results, key=lambda x: x["profit_pct"])[:10]
-    for r in worst:
-        print(f"  {r['price_30d']*100:.0f}% -> {r['price_3d']*100:.0f}% ({r['profit_pct']:.1f}%): {r['question']}")
+    worst = heapq.nsmallest(10, range(len(results)), key=profits.__getitem__)
+    for i in worst:
+        print(f"  {p30[i]*100:.0f}% -> {p3[i]*100:.0f}% ({profits[i]:.1f}%): {results.questions[i][:60]}")
 
     # Show best wins
     print("\n" + "-" * 80)
     print("BEST WINS")
     print("-" * 80)
 
-    best = sorted(results, key=lambda x: x["profit_pct"], reverse=True)[:10]
-    for r in best:
-        print(f"  {r['price_30d']*100:.0f}% -> {r['price_3d']*100:.0f}% ({r['profit_pct']:.1f}%): {r['question']}")
+    best = heapq.nlargest(10, range(len(results)), key=profits.__getitem__)
+    for i in best:
+        print(f"  {p30[i]*100:.0f}% -> {p3[i]*100:.0f}% ({profits[i]:.1f}%): {results.questions[i][:60]}")
 
 
 async def main():
-    results = await analyze_trading_strategy()
+    load_price_cache()
+    try:
+        results = await analyze_trading_strategy()
+    finally:
+        await flush_price_cache()
     print_results(results)
 
-    with open("trading_strategy_results.json", "w") as f:
-        json.dump(results, f, indent=2)
+    with open("trading_strategy_results.json", "wb") as f:
+        f.write(orjson.dumps(results.to_dicts(), option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     print(f"\nResults saved to trading_strategy_results.json")
 
 
 if __name__ == "__main__":
+    # uvloop (installed with uvicorn[standard]) cuts per-task overhead in the
+    # request fan-out; keep the default loop where it's unavailable (Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     asyncio.run(main())